@@ -6,24 +6,43 @@ import tkinter as tk
 import sv_ttk
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 from src.gui.main_window import MainWindow
+from src.analysis import ModelLoader
+from src.utils.helpers import start_logging
 
 def main():
     """
     Main entry point for the application.
     """
+    # Log from a background thread so batch workers don't contend on stderr
+    log_listener = start_logging()
+    
     # Create the Tkinter root window
     root = tk.Tk()
     
     # Initialize the main window
     app = MainWindow(root)
     
+    # Load the analysis models in the background so they are ready (or close to it)
+    # by the time the first analysis is requested
+    ModelLoader().load_models(
+        actions=['age', 'gender', 'emotion', 'race'],
+        callback=lambda: root.after(0, app.on_models_ready)
+    )
+    
     # Run the application
-    app.run()
+    try:
+        app.run()
+    finally:
+        log_listener.stop()
 
 if __name__ == "__main__":
+    # Needed for spawned batch worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    
     try:
         main()
     except Exception as e:
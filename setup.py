@@ -9,7 +9,7 @@ setup(
     py_modules=["main"],
     include_package_data=True,
     install_requires=[
-        "deepface>=0.0.79",
+        "deepface>=0.0.94",
         "opencv-python>=4.5.0",
         "Pillow>=8.0.0",
         "numpy>=1.19.0",
@@ -22,13 +22,12 @@ setup(
             "age-detection-app=main:main",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: End Users/Desktop",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
@@ -2,16 +2,92 @@
 Face analysis module using deepface for detecting age, gender, emotion, and race.
 """
 import os
+import functools
+import importlib.util
+import logging
 import time
 import tkinter as tk
 from tkinter import ttk
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List, Optional, Union, Tuple, Callable
 import numpy as np
+import cv2
 from pathlib import Path
 import pandas as pd
+
+# deepface picks its engine in backend_utils from 0.0.101 on, earlier releases always
+# run on TensorFlow. Importing it loads no framework.
+try:
+    from deepface.commons import backend_utils as deepface_backends
+except ImportError:
+    deepface_backends = None
+
+# Run deepface on ONNX Runtime when it is installed and the deepface release has an
+# ONNX engine (0.0.102 and later), it is considerably faster than TensorFlow on CPU.
+# The engine is fixed when deepface builds its first model, and an explicit
+# DEEPFACE_BACKEND_ENGINE set by the user always wins.
+if (
+    deepface_backends is not None
+    and getattr(deepface_backends, "ONNX", None) in getattr(deepface_backends, "BACKENDS", ())
+    and importlib.util.find_spec("onnxruntime") is not None
+):
+    os.environ.setdefault("DEEPFACE_BACKEND_ENGINE", "onnx")
+
+import deepface
 from deepface import DeepFace
-from src.utils.helpers import validate_face_detection, is_supported_image
+from src.utils.helpers import validate_face_detection, load_image, find_image_files
+
+logger = logging.getLogger(__name__)
+
+def _deepface_engine() -> Optional[str]:
+    """
+    Get the engine deepface runs its models on.
+    
+    Returns:
+        Optional[str]: 'tensorflow', 'pytorch' or 'onnx', or None if deepface rejects
+            the engine DEEPFACE_BACKEND_ENGINE asks for
+    """
+    if deepface_backends is None:
+        return "tensorflow"
+    try:
+        return deepface_backends.get_backend_engine()
+    except ValueError as e:
+        logger.warning("Could not determine deepface's engine: %s", e)
+        return None
+
+# Opt-in XLA compilation for the TensorFlow engine. Each attribute model's graph is
+# compiled into fused kernels, so a batch launches far fewer of them, at the cost of
+# a compile per model and batch shape on first use.
+USE_XLA = os.environ.get("AGE_DETECTION_XLA", "").lower() in ("1", "true", "yes")
+if USE_XLA and _deepface_engine() != "tensorflow":
+    logger.warning("XLA needs deepface's TensorFlow engine, running without it")
+elif USE_XLA:
+    try:
+        import tensorflow as tf
+        tf.config.optimizer.set_jit(True)
+    except Exception as e:
+        logger.warning("XLA unavailable, running without it: %s", e)
+
+# Opt-in float16 compute for the TensorFlow engine on GPUs. The policy has to be set
+# before deepface builds its models; weights stay float32, so accuracy barely moves
+# while tensor cores roughly halve the attribute models' run time.
+USE_MIXED_PRECISION = os.environ.get("AGE_DETECTION_MIXED_PRECISION", "").lower() in ("1", "true", "yes")
+if USE_MIXED_PRECISION and _deepface_engine() != "tensorflow":
+    logger.warning("Mixed precision needs deepface's TensorFlow engine, running in float32")
+elif USE_MIXED_PRECISION:
+    try:
+        import tensorflow as tf
+        gpus = tf.config.list_physical_devices("GPU")
+        if gpus:
+            # Allocate GPU memory as the models need it instead of reserving all of it
+            for gpu in gpus:
+                tf.config.experimental.set_memory_growth(gpu, True)
+            tf.keras.mixed_precision.set_global_policy("mixed_float16")
+        else:
+            logger.warning("Mixed precision needs a GPU, running in float32")
+    except Exception as e:
+        logger.warning("Mixed precision unavailable, running in float32: %s", e)
 
 # Global variable to track if models have been loaded
 MODELS_LOADED = {
@@ -21,10 +97,334 @@ MODELS_LOADED = {
     'race': False
 }
 
+# DeepFace model names for each analysis action
+ACTION_MODEL_NAMES = {
+    'age': 'Age',
+    'gender': 'Gender',
+    'emotion': 'Emotion',
+    'race': 'Race'
+}
+
+# Class labels in the order the attribute models output them
+EMOTION_LABELS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+GENDER_LABELS = ['Woman', 'Man']
+RACE_LABELS = ['asian', 'indian', 'black', 'white', 'middle eastern', 'latino hispanic']
+
+ACTION_LABELS = {
+    'gender': GENDER_LABELS,
+    'emotion': EMOTION_LABELS,
+    'race': RACE_LABELS
+}
+
+# Input size shared by the attribute models (emotion downsizes internally)
+ATTRIBUTE_INPUT_SIZE = (224, 224)
+
+# Faces are searched for down to 1/32 of the image's shorter side, but never below
+# the cascade's own 30 pixel minimum; smaller faces are too blurry to classify
+CASCADE_MIN_FACE = 30
+CASCADE_MIN_FACE_DIVISOR = 32
+
+# Built models shared by every FaceAnalyzer and ModelLoader, keyed by (task, model_name)
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_BUILD_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+
+# Opt-in int8 weight quantization of the attribute models (ONNX Runtime backend only),
+# the environment sets the default and set_quantized_models switches it at runtime
+QUANTIZE_MODELS = os.environ.get("AGE_DETECTION_QUANTIZE", "").lower() in ("1", "true", "yes")
+
+# Runs the attribute models of a batch concurrently, one thread per model
+_PREDICT_EXECUTOR = ThreadPoolExecutor(max_workers=len(ACTION_MODEL_NAMES), thread_name_prefix="predict")
+
+# Intra-op threads per ONNX Runtime session. The models run concurrently and the
+# detection threads need cores too, so each session gets a share of the cores
+ORT_INTRA_OP_THREADS = max(1, (os.cpu_count() or 2) // 4)
+
+# Full precision sessions of the attribute models currently running quantized
+_FULL_PRECISION_SESSIONS: Dict[Tuple[str, str], Any] = {}
+
+# ONNX files the attribute models were built from, their sessions may load an optimized copy
+_SOURCE_MODEL_PATHS: Dict[Tuple[str, str], str] = {}
+
+# Hardware execution providers tried before the CPU, in order of preference
+ORT_ACCELERATED_PROVIDERS = ['CUDAExecutionProvider', 'CoreMLExecutionProvider', 'DmlExecutionProvider']
+
+# Opt-in TensorRT with float16 kernels ahead of CUDA. Building an engine takes
+# minutes, so built engines are cached next to the weights and reused
+USE_TENSORRT_FP16 = os.environ.get("AGE_DETECTION_TENSORRT_FP16", "").lower() in ("1", "true", "yes")
+
+# Providers whose optimized graphs can be saved and reloaded, the others compile
+# parts of the graph into kernels that can't be written back to an ONNX file
+ORT_CACHEABLE_PROVIDERS = ['CPUExecutionProvider', 'CUDAExecutionProvider']
+
+def build_model(model_name: str, task: str = "facial_attribute") -> Any:
+    """
+    Build a deepface model once and return the cached instance on later calls.
+    
+    DeepFace.analyze/represent/verify look models up in deepface's own registry,
+    so building a model here also makes those calls skip the lazy construction.
+    
+    Args:
+        model_name: The deepface model name (e.g. Age, Emotion, Facenet512)
+        task: The deepface task the model belongs to
+        
+    Returns:
+        Any: The built model
+    """
+    key = (task, model_name)
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+        
+    # Lock per model so different models can be built concurrently
+    with _MODEL_CACHE_LOCK:
+        lock = _MODEL_BUILD_LOCKS.setdefault(key, threading.Lock())
+        
+    with lock:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = DeepFace.build_model(model_name=model_name, task=task)
+            if task == "facial_attribute":
+                _tune_session(key, model)
+                if QUANTIZE_MODELS:
+                    _quantize_model(key, model)
+            _MODEL_CACHE[key] = model
+    return model
+
+def _session_options() -> Any:
+    """
+    Build the ONNX Runtime session options shared by the attribute models.
+    
+    Returns:
+        Any: The onnxruntime.SessionOptions
+    """
+    import onnxruntime as ort
+    
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Batches of the same size reuse the memory layout planned for the first one
+    options.enable_mem_pattern = True
+    return options
+
+def _session_providers(session: Any) -> List[Any]:
+    """
+    Choose the execution providers for an attribute model's session.
+    
+    The first accelerated provider the installed onnxruntime build offers (CUDA,
+    CoreML or DirectML) is put ahead of the CPU, whichever providers deepface
+    created the session with, and TensorRT ahead of that when opted in. The CUDA
+    arena grows only as far as needed.
+    
+    Args:
+        session: The onnxruntime.InferenceSession
+        
+    Returns:
+        List[Any]: Provider names, or (name, options) pairs
+    """
+    import onnxruntime as ort
+    
+    available = ort.get_available_providers()
+    providers = [provider for provider in ORT_ACCELERATED_PROVIDERS if provider in available][:1]
+    if USE_TENSORRT_FP16 and 'TensorrtExecutionProvider' in available:
+        # Nodes TensorRT can't build fall through to the next provider
+        providers.insert(0, 'TensorrtExecutionProvider')
+    providers += [provider for provider in session.get_providers() if provider not in providers]
+    if 'CPUExecutionProvider' not in providers:
+        providers.append('CPUExecutionProvider')
+        
+    model_path = getattr(session, '_model_path', None) or '.'
+    provider_options = {
+        'CUDAExecutionProvider': {'arena_extend_strategy': 'kSameAsRequested'},
+        'TensorrtExecutionProvider': {
+            'trt_fp16_enable': True,
+            'trt_engine_cache_enable': True,
+            'trt_engine_cache_path': str(Path(model_path).parent / 'trt_cache')
+        }
+    }
+    return [
+        (provider, provider_options[provider]) if provider in provider_options else provider
+        for provider in providers
+    ]
+
+def _create_session(model_path: str, providers: List[Any]) -> Any:
+    """
+    Create an attribute model's session, reusing the graph optimized on an earlier run.
+    
+    The optimized graph is saved next to the weights the first time and loaded
+    without optimizing it again afterwards. Optimized graphs are specific to the
+    provider they were made for, so each provider gets its own copy.
+    
+    Args:
+        model_path: Path to the model's ONNX file
+        providers: Execution providers as returned by _session_providers
+        
+    Returns:
+        Any: The onnxruntime.InferenceSession
+    """
+    import onnxruntime as ort
+    
+    provider = providers[0] if isinstance(providers[0], str) else providers[0][0]
+    if provider not in ORT_CACHEABLE_PROVIDERS:
+        return ort.InferenceSession(model_path, sess_options=_session_options(), providers=providers)
+        
+    suffix = provider.replace('ExecutionProvider', '').lower()
+    optimized_path = str(Path(model_path).with_suffix(f'.{suffix}.opt.onnx'))
+    if os.path.exists(optimized_path):
+        options = _session_options()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(optimized_path, sess_options=options, providers=providers)
+        except Exception as e:
+            # Left behind by another onnxruntime version or an interrupted write
+            logger.warning("Could not load the optimized graph, optimizing again: %s", e)
+            
+    options = _session_options()
+    options.optimized_model_filepath = optimized_path
+    try:
+        return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+    except Exception as e:
+        logger.warning("Could not save the optimized graph: %s", e)
+        return ort.InferenceSession(model_path, sess_options=_session_options(), providers=providers)
+
+def _tune_session(key: Tuple[str, str], model: Any) -> None:
+    """
+    Recreate an ONNX attribute model's session with the app's session options.
+    
+    deepface creates its sessions with the defaults, which use a thread per core
+    and compete with the detection threads, and optimize the graph on every start.
+    Models that don't run on ONNX Runtime are left as is.
+    
+    Args:
+        key: The model's (task, model_name) cache key
+        model: The built deepface attribute model
+    """
+    session = getattr(model, 'model', None)
+    model_path = getattr(session, '_model_path', None)
+    if not model_path or not hasattr(session, 'get_providers'):
+        return
+        
+    _SOURCE_MODEL_PATHS[key] = model_path
+    try:
+        model.model = _create_session(model_path, _session_providers(session))
+    except Exception as e:
+        logger.warning("Could not tune the ONNX session, using the defaults: %s", e)
+
+def _quantize_model(key: Tuple[str, str], model: Any) -> None:
+    """
+    Swap an ONNX attribute model's session for one running int8 quantized weights.
+    
+    The quantized graph is written next to the original weights the first time
+    and reused afterwards. Models that don't run on ONNX Runtime are left as is.
+    
+    Args:
+        key: The model's (task, model_name) cache key
+        model: The built deepface attribute model
+    """
+    if key in _FULL_PRECISION_SESSIONS:
+        return
+        
+    session = getattr(model, 'model', None)
+    model_path = _SOURCE_MODEL_PATHS.get(key) or getattr(session, '_model_path', None)
+    if not model_path or not hasattr(session, 'get_providers'):
+        return
+        
+    try:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        quantized_path = str(Path(model_path).with_suffix('.int8.onnx'))
+        if not os.path.exists(quantized_path):
+            quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QUInt8)
+            
+        model.model = _create_session(quantized_path, _session_providers(session))
+        _FULL_PRECISION_SESSIONS[key] = session
+    except Exception as e:
+        logger.warning("Quantization error, using full precision weights: %s", e)
+
+def model_identity() -> Tuple[str, Optional[str]]:
+    """
+    Identify the models producing results, for results kept across runs.
+    
+    Returns:
+        Tuple[str, Optional[str]]: The deepface version and the engine it runs the models on
+    """
+    return getattr(deepface, '__version__', ''), _deepface_engine()
+
+def quantized_models_enabled() -> bool:
+    """
+    Check whether the attribute models run with quantized weights.
+    
+    Returns:
+        bool: True if quantization is enabled
+    """
+    return QUANTIZE_MODELS
+
+def set_quantized_models(enabled: bool) -> None:
+    """
+    Switch the attribute models between quantized and full precision weights.
+    
+    Models already built are switched in place, models built later follow the
+    new setting. Has no effect on models that don't run on ONNX Runtime.
+    
+    Args:
+        enabled: Whether to run the attribute models with int8 quantized weights
+    """
+    global QUANTIZE_MODELS
+    
+    with _MODEL_CACHE_LOCK:
+        QUANTIZE_MODELS = enabled
+        for key, model in list(_MODEL_CACHE.items()):
+            if key[0] != "facial_attribute":
+                continue
+            if enabled:
+                _quantize_model(key, model)
+            elif key in _FULL_PRECISION_SESSIONS:
+                model.model = _FULL_PRECISION_SESSIONS.pop(key)
+
+def get_attribute_model(action: str) -> Any:
+    """
+    Get the cached facial attribute model for an analysis action.
+    
+    Args:
+        action: The analysis action (age, gender, emotion or race)
+        
+    Returns:
+        Any: The built attribute model
+    """
+    model = build_model(ACTION_MODEL_NAMES[action], task="facial_attribute")
+    MODELS_LOADED[action] = True
+    return model
+
+def _scores_and_dominant(predictions: Any, num_faces: int, normalize: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a batch of class predictions to percentages and dominant class indices.
+    
+    Works in place on a single float64 buffer, so a batch costs one copy of the
+    model output regardless of its size.
+    
+    Args:
+        predictions: Model output with shape (N, C), or (C,) for a single face
+        num_faces: Number of faces N in the batch
+        normalize: Whether to rescale each row to sum to 100 rather than multiply by 100
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The (N, C) percentages and the (N,) dominant indices
+    """
+    scores = np.array(predictions, dtype=np.float64).reshape(num_faces, -1)
+    dominant = scores.argmax(axis=1)
+    if normalize:
+        scores /= scores.sum(axis=1, keepdims=True)
+    scores *= 100
+    return scores, dominant
+
 class ModelLoader:
     """
     Class for loading deepface models with progress indication.
     """
+    # Interval at which the progress dialog reads the loader thread's progress
+    PROGRESS_POLL_MS = 50
+    
     def __init__(self, parent=None):
         """
         Initialize the model loader.
@@ -36,7 +436,10 @@ class ModelLoader:
         self.progress_dialog = None
         self.progress_bar = None
         self.status_label = None
-        self.cancel_flag = False
+        self._cancel = threading.Event()
+        
+        # Latest (action, percentage) written by the loader thread, polled by the UI
+        self._progress: Optional[Tuple[str, float]] = None
         
     def load_models(self, actions: List[str], callback: Optional[Callable] = None):
         """
@@ -56,10 +459,11 @@ class ModelLoader:
         if self.parent:
             self._create_progress_dialog(actions)
             
-        # Start loading thread
+        # Start loading thread, as a daemon so it never keeps the app from exiting
         threading.Thread(
             target=self._load_models_thread,
-            args=(actions, callback)
+            args=(actions, callback),
+            daemon=True
         ).start()
         
     def _create_progress_dialog(self, actions: List[str]):
@@ -113,39 +517,47 @@ class ModelLoader:
         self.progress_bar['maximum'] = len(actions)
         self.progress_bar['value'] = 0
         
+        # Poll the loader thread's progress from the Tk thread
+        self.progress_dialog.after(self.PROGRESS_POLL_MS, self._poll_progress)
+        
     def _load_models_thread(self, actions: List[str], callback: Optional[Callable] = None):
         """
         Thread for loading models.
         
+        The models are independent, so they are downloaded and built concurrently.
+        
         Args:
             actions: List of actions to load models for
             callback: Callback to execute when loading is complete
         """
         total_actions = len(actions)
+        pending = [action for action in actions if not MODELS_LOADED.get(action, False)]
+        completed = total_actions - len(pending)
         
         try:
-            for i, action in enumerate(actions):
-                if self.cancel_flag:
-                    break
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as executor:
+                future_to_action = {
+                    executor.submit(self._load_model, action): action
+                    for action in pending
+                }
                 
-                # Update progress dialog
-                if self.progress_dialog:
-                    self.progress_dialog.after(
-                        0, 
-                        lambda a=action, p=(i/total_actions)*100: self._update_progress(a, p)
-                    )
-                
-                # Analyze a dummy image to force model loading
-                if not MODELS_LOADED.get(action, False):
-                    # Create a simple black 100x100 image as a dummy
-                    dummy_img = np.zeros((100, 100, 3), dtype=np.uint8)
-                    DeepFace.analyze(
-                        img_path=dummy_img,
-                        actions=[action],
-                        enforce_detection=False,
-                        silent=True
-                    )
-                    MODELS_LOADED[action] = True
+                for future in as_completed(future_to_action):
+                    action = future_to_action[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Error loading {action} model: {str(e)}")
+                        
+                    completed += 1
+                    
+                    # Publish progress, the dialog picks it up on its next poll
+                    self._progress = (action, (completed/total_actions)*100)
+                        
+                    if self._cancel.is_set():
+                        # Builds already running can't be interrupted, drop the rest
+                        for pending_future in future_to_action:
+                            pending_future.cancel()
+                        break
                     
         except Exception as e:
             print(f"Error loading models: {str(e)}")
@@ -156,12 +568,38 @@ class ModelLoader:
                 self.progress_dialog.after(0, self._close_dialog)
                 
             # Execute callback
-            if callback and not self.cancel_flag:
+            if callback and not self._cancel.is_set():
                 if self.progress_dialog:
                     self.progress_dialog.after(0, callback)
                 else:
                     callback()
                     
+    @staticmethod
+    def _load_model(action: str) -> None:
+        """
+        Build the model for an action and warm it up with a dummy inference.
+        
+        The dummy batch has the same shape as a real analysis so the first
+        user-triggered analysis doesn't pay for kernel selection and allocation.
+        
+        Args:
+            action: The action to load the model for
+        """
+        model = get_attribute_model(action)
+        model.predict(np.zeros((1, *ATTRIBUTE_INPUT_SIZE, 3), dtype=np.float32))
+        
+    def _poll_progress(self):
+        """
+        Apply the latest published progress and schedule the next poll.
+        """
+        if not self.progress_dialog or not self.progress_dialog.winfo_exists():
+            return
+            
+        progress = self._progress
+        if progress is not None:
+            self._update_progress(*progress)
+        self.progress_dialog.after(self.PROGRESS_POLL_MS, self._poll_progress)
+        
     def _update_progress(self, action: str, progress: float):
         """
         Update the progress dialog.
@@ -172,7 +610,7 @@ class ModelLoader:
         """
         if self.progress_dialog and self.progress_dialog.winfo_exists():
             self.progress_bar['value'] = progress / 100 * self.progress_bar['maximum']
-            self.status_label.config(text=f"Loading {action} model...")
+            self.status_label.config(text=f"Loaded {action} model")
             
     def _close_dialog(self):
         """
@@ -187,7 +625,7 @@ class ModelLoader:
         """
         Cancel the loading process.
         """
-        self.cancel_flag = True
+        self._cancel.set()
 
 class FaceAnalyzer:
     """
@@ -196,7 +634,9 @@ class FaceAnalyzer:
     def __init__(self, 
                  detector_backend: str = "opencv", 
                  enforce_detection: bool = False,
-                 align: bool = True):
+                 align: bool = True,
+                 preload_actions: Optional[List[str]] = None,
+                 detection_max_side: Optional[int] = None):
         """
         Initialize the face analyzer.
         
@@ -204,10 +644,37 @@ class FaceAnalyzer:
             detector_backend: The face detector backend to use
             enforce_detection: Whether to enforce face detection
             align: Whether to align detected faces
+            preload_actions: Actions whose models should be built immediately
+            detection_max_side: With the opencv detector, search for faces on a copy
+                of the image shrunk to this longer side; the face itself is still
+                cropped from the full image
         """
         self.detector_backend = detector_backend
         self.enforce_detection = enforce_detection
         self.align = align
+        self.detection_max_side = detection_max_side
+        self.models: Dict[str, Any] = {}
+        
+        # OpenCV cascades used directly for the opencv backend, created on first use
+        self._face_cascade = None
+        self._eye_cascade = None
+        
+        # Input batch reused across model calls, grown to the largest batch seen
+        self._batch_buffer: Optional[np.ndarray] = None
+        
+        if preload_actions:
+            self.preload_models(preload_actions)
+            
+    def preload_models(self, actions: List[str]) -> None:
+        """
+        Build the models for the given actions so the first analysis doesn't pay for it.
+        
+        Args:
+            actions: List of analysis actions to load models for
+        """
+        for action in actions:
+            if action not in self.models:
+                self.models[action] = get_attribute_model(action)
         
     def analyze_face(self, 
                      img_path: Union[str, np.ndarray, Path], 
@@ -215,6 +682,9 @@ class FaceAnalyzer:
         """
         Analyze a face in an image.
         
+        The face is detected once with extract_faces and the same aligned crop is
+        fed to every requested attribute model.
+        
         Args:
             img_path: Path to the image, numpy array, or Path object
             actions: List of analysis actions to perform (age, gender, emotion, race)
@@ -225,39 +695,386 @@ class FaceAnalyzer:
         if actions is None:
             actions = ['age', 'gender', 'emotion', 'race']
             
+        # For this application, we'll focus on the first face detected
+        detection = self._extract_face(img_path)
+        if detection is None:
+            logger.info("No faces detected in the image.")
+            return None
+        face, region, confidence = detection
+            
+        try:
+            result = self._predict_attributes(face[np.newaxis], actions)[0]
+            result['region'] = region
+            result['face_confidence'] = confidence
+            return result
+            
+        except Exception as e:
+            # This likely means no face was detected or another error occurred
+            logger.warning("Analysis error: %s", e)
+            return None
+    
+    def analyze_faces(self, 
+                      images: List[Union[str, np.ndarray, Path]], 
+                      actions: List[str] = None,
+                      batch_size: int = 32) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze the first face in each of several images with batched model calls.
+        
+        Faces are detected per image, then every attribute model runs once per
+        batch of faces instead of once per image.
+        
+        Args:
+            images: List of image paths, numpy arrays, or Path objects
+            actions: List of analysis actions to perform (age, gender, emotion, race)
+            batch_size: Maximum number of faces passed to a model at once
+            
+        Returns:
+            List[Optional[Dict[str, Any]]]: One result per image, None where analysis failed
+        """
+        if actions is None:
+            actions = ['age', 'gender', 'emotion', 'race']
+            
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            
+            # Detect and prepare the faces for this chunk
+            indices = []
+            detections = []
+            for offset, image in enumerate(chunk):
+                detection = self.detect_face(image)
+                if detection is not None:
+                    indices.append(start + offset)
+                    detections.append(detection)
+                    
+            for index, result in zip(indices, self.analyze_detections(detections, actions)):
+                results[index] = result
+                
+        return results
+    
+    def analyze_best_face(self, 
+                          images: List[Union[str, np.ndarray, Path]], 
+                          actions: List[str] = None) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """
+        Analyze the most confidently detected face among several images of the same scene.
+        
+        Faces are detected in every image but the attribute models only run on
+        the best detection, so a burst of frames costs little more than one.
+        
+        Args:
+            images: List of image paths, numpy arrays, or Path objects
+            actions: List of analysis actions to perform (age, gender, emotion, race)
+            
+        Returns:
+            Tuple[Optional[int], Optional[Dict[str, Any]]]: Index of the image the face
+                was found in and the analysis result, (None, None) if no face was detected
+        """
+        best_index, best_detection = self.detect_best_face(images)
+        if best_detection is None:
+            return None, None
+            
+        return best_index, self.analyze_detections([best_detection], actions)[0]
+    
+    def detect_best_face(self, 
+                         images: List[Union[str, np.ndarray, Path]]) -> Tuple[Optional[int], Optional[Tuple[np.ndarray, Dict[str, Any], float]]]:
+        """
+        Find the most confidently detected face among several images of the same scene.
+        
+        Args:
+            images: List of image paths, numpy arrays, or Path objects
+            
+        Returns:
+            Tuple[Optional[int], Optional[Tuple[np.ndarray, Dict[str, Any], float]]]: Index of
+                the image the face was found in and its detection as returned by
+                detect_face, (None, None) if no face was detected
+        """
+        best_index, best_detection = None, None
+        for index, image in enumerate(images):
+            detection = self.detect_face(image)
+            if detection is not None and (best_detection is None or detection[2] > best_detection[2]):
+                best_index, best_detection = index, detection
+                
+        if best_detection is None:
+            logger.info("No faces detected in the images.")
+            
+        return best_index, best_detection
+    
+    def detect_face(self, img_path: Union[str, np.ndarray, Path]) -> Optional[Tuple[np.ndarray, Dict[str, Any], float]]:
+        """
+        Detect the first face in an image and prepare it for the attribute models.
+        
+        Args:
+            img_path: Path to the image, numpy array, or Path object
+            
+        Returns:
+            Optional[Tuple[np.ndarray, Dict[str, Any], float]]: The prepared face,
+                its region and the detection confidence, or None if detection failed
+        """
+        return self._extract_face(img_path)
+    
+    def analyze_detections(self, 
+                           detections: List[Tuple[np.ndarray, Dict[str, Any], float]], 
+                           actions: List[str] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run the attribute models once over faces returned by detect_face.
+        
+        Args:
+            detections: Prepared faces with their regions and confidences
+            actions: List of analysis actions to perform (age, gender, emotion, race)
+            
+        Returns:
+            List[Optional[Dict[str, Any]]]: One result per face, all None if the models failed
+        """
+        if not detections:
+            return []
+            
+        if actions is None:
+            actions = ['age', 'gender', 'emotion', 'race']
+            
+        try:
+            results = self._predict_attributes(self._stack_faces([face for face, _, _ in detections]), actions)
+        except Exception as e:
+            logger.warning("Analysis error: %s", e)
+            return [None] * len(detections)
+            
+        for (_, region, confidence), result in zip(detections, results):
+            result['region'] = region
+            result['face_confidence'] = confidence
+        return results
+    
+    def _stack_faces(self, faces: List[np.ndarray]) -> np.ndarray:
+        """
+        Stack prepared faces into the reusable input batch.
+        
+        The models only read the batch while predicting, so every batch can be
+        written into the same contiguous buffer instead of a new allocation.
+        
+        Args:
+            faces: Prepared faces of shape (224, 224, 3)
+            
+        Returns:
+            np.ndarray: View of the buffer with shape (N, 224, 224, 3)
+        """
+        buffer = self._batch_buffer
+        if buffer is None or buffer.shape[0] < len(faces):
+            buffer = self._batch_buffer = np.empty((len(faces), *ATTRIBUTE_INPUT_SIZE, 3), dtype=np.float32)
+        return np.stack(faces, out=buffer[:len(faces)])
+    
+    def _extract_face(self, 
+                      img_path: Union[str, np.ndarray, Path]) -> Optional[Tuple[np.ndarray, Dict[str, Any], float]]:
+        """
+        Detect the first face in an image and prepare it for the attribute models.
+        
+        Args:
+            img_path: Path to the image, numpy array, or Path object
+            
+        Returns:
+            Optional[Tuple[np.ndarray, Dict[str, Any], float]]: The prepared face,
+                its region and the detection confidence, or None if detection failed
+        """
+        if isinstance(img_path, Path):
+            img_path = str(img_path)
+            
+        # Run the Haar cascades ourselves rather than through deepface's wrapper
+        # (OpenCV 5 moved CascadeClassifier to contrib, deepface handles that case)
+        if self.detector_backend == "opencv" and hasattr(cv2, "CascadeClassifier"):
+            image = img_path if isinstance(img_path, np.ndarray) else load_image(img_path)
+            if image is None:
+                logger.warning("Could not read image: %s", img_path)
+                return None
+            try:
+                return self._detect_with_cascade(image)
+            except Exception as e:
+                logger.warning("Face detection error: %s", e)
+                return None
+            
         try:
-            result = DeepFace.analyze(
+            face_objs = DeepFace.extract_faces(
                 img_path=img_path,
                 detector_backend=self.detector_backend,
                 enforce_detection=self.enforce_detection,
-                align=self.align,
-                actions=actions
+                align=self.align
             )
+        except Exception as e:
+            logger.warning("Face detection error: %s", e)
+            return None
             
-            # DeepFace.analyze returns a list of dictionaries, one for each face detected
-            # For this application, we'll focus on the first face detected
-            if result and isinstance(result, list) and len(result) > 0:
-                return result[0]
-            else:
-                print("No faces detected in the image.")
+        for face_obj in face_objs:
+            face = face_obj['face']
+            if face.shape[0] == 0 or face.shape[1] == 0:
+                continue
+            # extract_faces returns RGB, the attribute models expect BGR
+            return (
+                self._prepare_face(face[:, :, ::-1]),
+                face_obj['facial_area'],
+                face_obj.get('confidence', 0)
+            )
+        return None
+    
+    def _detect_with_cascade(self, image: np.ndarray) -> Optional[Tuple[np.ndarray, Dict[str, Any], float]]:
+        """
+        Detect the largest face with OpenCV's Haar cascades and align it on the eyes.
+        
+        Mirrors deepface's opencv backend, including returning the whole image with
+        zero confidence when no face is found and detection isn't enforced.
+        
+        Args:
+            image: The image in BGR order
+            
+        Returns:
+            Optional[Tuple[np.ndarray, Dict[str, Any], float]]: The prepared face,
+                its region and the detection confidence, or None if no face was found
+        """
+        if self._face_cascade is None:
+            self._face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+            self._eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_eye.xml")
+            
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            
+        # Search a shrunken copy of large images, the boxes are mapped back afterwards
+        search_gray, scale = gray, 1.0
+        longer_side = max(gray.shape[:2])
+        if self.detection_max_side and longer_side > self.detection_max_side:
+            scale = longer_side / self.detection_max_side
+            search_size = (max(1, round(gray.shape[1] / scale)), max(1, round(gray.shape[0] / scale)))
+            search_gray = cv2.resize(gray, search_size, interpolation=cv2.INTER_AREA)
+            
+        # Skip the pyramid levels for faces too small to analyze, the finest levels
+        # cover the most pixels and cost most of the detection time
+        min_side = max(CASCADE_MIN_FACE, min(search_gray.shape[:2]) // CASCADE_MIN_FACE_DIVISOR)
+        faces, _, scores = self._face_cascade.detectMultiScale3(
+            search_gray, 1.1, 10, minSize=(min_side, min_side), outputRejectLevels=True
+        )
+        
+        if len(faces) == 0:
+            if self.enforce_detection:
                 return None
+            height, width = image.shape[:2]
+            region = {'x': 0, 'y': 0, 'w': width, 'h': height, 'left_eye': None, 'right_eye': None}
+            return self._prepare_face(image), region, 0
             
-        except Exception as e:
-            # This likely means no face was detected or another error occurred
-            print(f"Analysis error: {str(e)}")
-            return None
+        # Keep the largest face
+        faces = np.asarray(faces)
+        index = int(np.argmax(faces[:, 2] * faces[:, 3]))
+        x, y, w, h = (int(v) for v in faces[index])
+        if scale != 1.0:
+            height, width = gray.shape[:2]
+            x, y = min(int(x * scale), width - 1), min(int(y * scale), height - 1)
+            w, h = min(round(w * scale), width - x), min(round(h * scale), height - y)
+        confidence = float((100 - np.ravel(scores)[index]) / 100)
+        face = image[y:y + h, x:x + w]
+        
+        # The two largest eyes; the one on the image's left is the subject's right eye
+        left_eye = right_eye = None
+        eyes = sorted(self._eye_cascade.detectMultiScale(gray[y:y + h, x:x + w], 1.1, 10),
+                      key=lambda e: e[2] * e[3], reverse=True)
+        if len(eyes) >= 2:
+            centers = sorted((int(x + ex + ew / 2), int(y + ey + eh / 2)) for ex, ey, ew, eh in eyes[:2])
+            right_eye, left_eye = centers
+            
+            if self.align:
+                angle = np.degrees(np.arctan2(left_eye[1] - right_eye[1], left_eye[0] - right_eye[0]))
+                rotation = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+                face = cv2.warpAffine(face, rotation, (w, h))
+                
+        region = {'x': x, 'y': y, 'w': w, 'h': h, 'left_eye': left_eye, 'right_eye': right_eye}
+        return self._prepare_face(face), region, confidence
+    
+    @staticmethod
+    def _prepare_face(face: np.ndarray) -> np.ndarray:
+        """
+        Letterbox a face crop to the attribute model input size.
+        
+        Args:
+            face: The face crop in BGR order
+            
+        Returns:
+            np.ndarray: Float32 image of shape (224, 224, 3) scaled to 0-1
+        """
+        target_h, target_w = ATTRIBUTE_INPUT_SIZE
+        factor = min(target_h / face.shape[0], target_w / face.shape[1])
+        new_w = max(1, int(face.shape[1] * factor))
+        new_h = max(1, int(face.shape[0] * factor))
+        resized = cv2.resize(face, (new_w, new_h))
+        
+        # Center the face on a black canvas
+        prepared = np.zeros((target_h, target_w, 3), dtype=np.float32)
+        top = (target_h - new_h) // 2
+        left = (target_w - new_w) // 2
+        placed = prepared[top:top + new_h, left:left + new_w]
+        
+        if resized.dtype == np.uint8:
+            # Scale 8-bit pixels while copying them, saving a pass over the canvas
+            np.multiply(resized, np.float32(1 / 255), out=placed, casting='unsafe')
+        else:
+            placed[...] = resized
+            if placed.max() > 1:
+                placed /= 255.0
+        return prepared
+    
+    def _predict_attributes(self, faces: np.ndarray, actions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Run each attribute model once over a batch of prepared faces.
+        
+        Args:
+            faces: Array of prepared faces with shape (N, 224, 224, 3)
+            actions: List of analysis actions to perform
+            
+        Returns:
+            List[Dict[str, Any]]: One result dictionary per face
+        """
+        num_faces = faces.shape[0]
+        results: List[Dict[str, Any]] = [{} for _ in range(num_faces)]
+        
+        models = []
+        for action in actions:
+            model = self.models.get(action)
+            if model is None:
+                model = self.models[action] = get_attribute_model(action)
+            models.append(model)
+            
+        # The models are independent and release the GIL while predicting, so run
+        # them side by side on the same batch
+        if len(models) > 1:
+            all_predictions = list(_PREDICT_EXECUTOR.map(lambda model: model.predict(faces), models))
+        else:
+            all_predictions = [model.predict(faces) for model in models]
+            
+        for action, predictions in zip(actions, all_predictions):
+            if action == 'age':
+                ages = np.atleast_1d(np.asarray(predictions, dtype=np.float64))
+                for result, age in zip(results, ages):
+                    result['age'] = int(age)
+                continue
+                
+            labels = ACTION_LABELS[action]
+            scores, dominant = _scores_and_dominant(predictions, num_faces, normalize=action != 'gender')
+            
+            for result, row, index in zip(results, scores.tolist(), dominant.tolist()):
+                result[action] = dict(zip(labels, row))
+                result[f'dominant_{action}'] = labels[index]
+                
+        return results
     
     def batch_analyze(self, 
                       folder_path: Union[str, Path], 
                       actions: List[str] = None,
-                      recursive: bool = False) -> Tuple[pd.DataFrame, List[str]]:
+                      recursive: bool = False,
+                      batch_size: int = 32) -> Tuple[pd.DataFrame, List[str]]:
         """
         Analyze faces in all images in a folder.
         
+        Images are decoded on a thread pool one batch ahead of the batch
+        currently being analyzed, so disk reads overlap with inference.
+        
         Args:
             folder_path: Path to the folder containing images
             actions: List of analysis actions to perform
             recursive: Whether to search recursively in subfolders
+            batch_size: Number of images decoded and analyzed together
             
         Returns:
             Tuple[pd.DataFrame, List[str]]: DataFrame of results and list of failed files
@@ -265,48 +1082,73 @@ class FaceAnalyzer:
         if actions is None:
             actions = ['age', 'gender', 'emotion', 'race']
             
-        # Convert to Path object if it's a string
-        if isinstance(folder_path, str):
-            folder_path = Path(folder_path)
-            
         # Get list of image files
-        all_files = []
+        all_files = find_image_files(folder_path, recursive)
         failed_files = []
         
-        if recursive:
-            for file_path in folder_path.rglob('*'):
-                if file_path.is_file() and is_supported_image(file_path):
-                    all_files.append(file_path)
-        else:
-            for file_path in folder_path.glob('*'):
-                if file_path.is_file() and is_supported_image(file_path):
-                    all_files.append(file_path)
+        # Accumulate results column by column so the DataFrame wraps them directly
+        columns: Dict[str, List[Any]] = {}
         
-        # Create a list to store results
-        results = []
+        batches = [all_files[i:i + batch_size] for i in range(0, len(all_files), batch_size)]
         
-        # Process each file
-        for file_path in all_files:
-            try:
-                result = self.analyze_face(file_path, actions)
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            pending = [executor.submit(load_image, file_path) for file_path in batches[0]] if batches else []
+            
+            for index, batch in enumerate(batches):
+                images = [future.result() for future in pending]
                 
-                if result:
-                    # Add the file path to the result
-                    result['file_path'] = str(file_path)
-                    results.append(result)
-                else:
-                    failed_files.append(str(file_path))
+                # Start decoding the next batch while this one is analyzed
+                if index + 1 < len(batches):
+                    pending = [executor.submit(load_image, file_path) for file_path in batches[index + 1]]
                 
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
-                failed_files.append(str(file_path))
+                decoded = []
+                for file_path, image in zip(batch, images):
+                    if image is None:
+                        failed_files.append(file_path)
+                    else:
+                        decoded.append((file_path, image))
+                        
+                # Analyze the decoded images with batched model calls
+                batch_results = self.analyze_faces([image for _, image in decoded], actions, batch_size)
+                for (file_path, _), result in zip(decoded, batch_results):
+                    if result:
+                        # Add the file path to the result
+                        result['file_path'] = file_path
+                        for key, value in result.items():
+                            columns.setdefault(key, []).append(value)
+                    else:
+                        failed_files.append(file_path)
         
         # Convert results to DataFrame
-        if results:
-            return pd.DataFrame(results), failed_files
+        if columns:
+            return self._columns_to_frame(columns), failed_files
         else:
             return pd.DataFrame(), failed_files
     
+    @staticmethod
+    def _columns_to_frame(columns: Dict[str, List[Any]]) -> pd.DataFrame:
+        """
+        Build a results DataFrame from per-column value lists.
+        
+        Numeric columns are converted to typed arrays up front so pandas doesn't
+        have to infer their dtype cell by cell.
+        
+        Args:
+            columns: Mapping of column name to the values for every result
+            
+        Returns:
+            pd.DataFrame: The results DataFrame
+        """
+        data: Dict[str, Any] = {}
+        for key, values in columns.items():
+            if key == 'age':
+                data[key] = np.asarray(values, dtype=np.int64)
+            elif key == 'face_confidence':
+                data[key] = np.asarray(values, dtype=np.float64)
+            else:
+                data[key] = values
+        return pd.DataFrame(data)
+    
     def verify_face(self, 
                    img_path1: Union[str, np.ndarray, Path], 
                    img_path2: Union[str, np.ndarray, Path],
@@ -325,6 +1167,7 @@ class FaceAnalyzer:
             Optional[Dict[str, Any]]: Verification result or None if error
         """
         try:
+            build_model(model_name, task="facial_recognition")
             result = DeepFace.verify(
                 img1_path=img_path1,
                 img2_path=img_path2,
@@ -353,6 +1196,7 @@ class FaceAnalyzer:
             Optional[np.ndarray]: Facial embedding or None if error
         """
         try:
+            build_model(model_name, task="facial_recognition")
             embedding_objs = DeepFace.represent(
                 img_path=img_path,
                 model_name=model_name,
@@ -368,3 +1212,17 @@ class FaceAnalyzer:
         except Exception as e:
             print(f"Embedding error: {str(e)}")
             return None
+
+@functools.lru_cache(maxsize=1)
+def get_face_analyzer() -> FaceAnalyzer:
+    """
+    Get the application's shared batch face analyzer, created on first use.
+    
+    The attribute models are cached per process already, sharing the analyzer
+    also keeps its detector state when the batch tab is rebuilt. The camera
+    analyzes on its own thread and keeps a separate instance.
+    
+    Returns:
+        FaceAnalyzer: The shared face analyzer
+    """
+    return FaceAnalyzer()
@@ -3,49 +3,257 @@ Batch processing module for analyzing multiple images.
 """
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional, Union, Callable
+import numpy as np
 import pandas as pd
 import json
 import csv
+import logging
 import time
+import queue
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from src.analysis import FaceAnalyzer
-from src.utils.helpers import ensure_directory_exists, generate_timestamp_filename
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from src.analysis import (
+    FaceAnalyzer, model_identity, quantized_models_enabled, set_quantized_models,
+    GENDER_LABELS, EMOTION_LABELS, RACE_LABELS
+)
+from src.io_prefetch import ImagePrefetcher
+from src.result_cache import ResultCache
+from src.export import Exporter, Results
+from src.utils.helpers import ensure_directory_exists, generate_timestamp_filename, load_image_reduced, decode_image_reduced, scale_region, find_image_files
+
+logger = logging.getLogger(__name__)
+
+# Result columns produced by each analysis action
+ACTION_COLUMNS = {
+    'age': ['age'],
+    'gender': ['gender', 'dominant_gender'],
+    'emotion': ['emotion', 'dominant_emotion'],
+    'race': ['race', 'dominant_race']
+}
+
+# Numeric result columns, the rest hold strings and dictionaries
+RESULT_DTYPES = {
+    'age': 'int64',
+    'face_confidence': 'float64'
+}
+
+# Label columns with a fixed set of values, stored as categoricals so each row
+# holds a small code instead of a string object
+CATEGORY_COLUMNS = {
+    'dominant_gender': GENDER_LABELS,
+    'dominant_emotion': EMOTION_LABELS,
+    'dominant_race': RACE_LABELS
+}
+
+# Progress is reported after at least this many files or seconds, whichever comes first
+PROGRESS_MIN_FILES = 16
+PROGRESS_MIN_INTERVAL = 0.2
+
+# Minimum number of files read ahead of the detection threads
+PREFETCH_DEPTH = 64
+
+# Seconds between cancel checks while waiting on a pipeline queue
+QUEUE_POLL_INTERVAL = 0.1
+
+# Analyzer owned by the current worker process when processing with processes
+_WORKER_ANALYZER: Optional[FaceAnalyzer] = None
+
+def _init_worker(detector_backend: str, enforce_detection: bool, align: bool, quantized: bool = False) -> None:
+    """
+    Create the analyzer for a worker process.
+    
+    Args:
+        detector_backend: The face detector backend to use
+        enforce_detection: Whether to enforce face detection
+        align: Whether to align detected faces
+        quantized: Whether to run the attribute models with quantized weights
+    """
+    global _WORKER_ANALYZER
+    set_quantized_models(quantized)
+    _WORKER_ANALYZER = FaceAnalyzer(
+        detector_backend=detector_backend,
+        enforce_detection=enforce_detection,
+        align=align
+    )
+
+def _analyze_files(analyzer: FaceAnalyzer, 
+                   file_paths: List[str], 
+                   actions: List[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Decode and analyze a batch of image files with one model call per action.
+    
+    Args:
+        analyzer: The face analyzer to use
+        file_paths: Paths to the image files
+        actions: List of analysis actions to perform
+        
+    Returns:
+        List[Optional[Dict[str, Any]]]: One result per file, None where analysis failed
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+    
+    # Decode with OpenCV and hand the analyzer arrays so it skips its own loader,
+    # large JPEGs are decoded reduced and their regions scaled back afterwards
+    indices = []
+    images = []
+    scales = []
+    for index, file_path in enumerate(file_paths):
+        image, scale = load_image_reduced(file_path)
+        if image is not None:
+            indices.append(index)
+            images.append(image)
+            scales.append(scale)
+            
+    if not images:
+        return results
+        
+    analyzed = analyzer.analyze_faces(images, actions, batch_size=len(images))
+    for index, scale, result in zip(indices, scales, analyzed):
+        if result:
+            if scale != 1 and result.get('region'):
+                result['region'] = scale_region(result['region'], scale)
+            result['file_path'] = file_paths[index]
+            result['file_name'] = Path(file_paths[index]).name
+            results[index] = result
+    return results
+
+def _process_batch_in_worker(file_paths: List[str], actions: List[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Process a batch of image files with the worker process's analyzer.
+    
+    Args:
+        file_paths: Paths to the image files
+        actions: List of analysis actions to perform
+        
+    Returns:
+        List[Optional[Dict[str, Any]]]: One result per file, None where analysis failed
+    """
+    try:
+        return _analyze_files(_WORKER_ANALYZER, file_paths, actions)
+    except Exception as e:
+        logger.warning("Error processing batch starting at %s: %s", file_paths[0], e)
+        return [None] * len(file_paths)
+
+def result_columns(actions: List[str] = None) -> List[str]:
+    """
+    Get the result columns produced by the given analysis actions.
+    
+    Args:
+        actions: List of analysis actions performed
+        
+    Returns:
+        List[str]: Column names in display order
+    """
+    if actions is None:
+        actions = list(ACTION_COLUMNS)
+        
+    columns = ['file_path', 'file_name']
+    for action in actions:
+        columns.extend(ACTION_COLUMNS.get(action, []))
+    columns.extend(['region', 'face_confidence'])
+    return columns
+
+def to_dataframe(results: List[Dict[str, Any]], actions: List[str] = None) -> pd.DataFrame:
+    """
+    Build a DataFrame from batch results.
+    
+    The frame is assembled column by column in one step, numeric columns are
+    filled straight into typed arrays so pandas neither infers nor converts them
+    and label columns are categoricals.
+    
+    Args:
+        results: List of result dictionaries from process_folder
+        actions: List of analysis actions the results were produced with
+        
+    Returns:
+        pd.DataFrame: DataFrame of results
+    """
+    if not results:
+        return pd.DataFrame()
+        
+    columns = {}
+    for column in result_columns(actions):
+        dtype = RESULT_DTYPES.get(column)
+        if dtype is not None:
+            columns[column] = np.fromiter(
+                (result.get(column) for result in results), dtype=dtype, count=len(results)
+            )
+        elif column in CATEGORY_COLUMNS:
+            columns[column] = pd.Categorical(
+                [result.get(column) for result in results], categories=CATEGORY_COLUMNS[column]
+            )
+        else:
+            columns[column] = [result.get(column) for result in results]
+    return pd.DataFrame(columns, copy=False)
 
 class BatchProcessor:
     """
     Class for batch processing images for face analysis.
     """
-    def __init__(self, face_analyzer: FaceAnalyzer = None):
+    def __init__(self, face_analyzer: FaceAnalyzer = None, result_cache: Optional[ResultCache] = None):
         """
         Initialize the batch processor.
         
         Args:
             face_analyzer: The face analyzer to use
+            result_cache: Cache of earlier results, files found in it are not analyzed again
         """
         self.face_analyzer = face_analyzer or FaceAnalyzer()
+        self.result_cache = result_cache
         self.processing = False
         self.progress_callback = None
         self.cancel_flag = False
         
+        # Analyzers checked out by worker threads, rebuilt when the worker count
+        # or the analyzer settings change
+        self._analyzer_pool: Optional[queue.Queue] = None
+        self._analyzer_pool_key = None
+        
+        # Worker processes kept alive between runs so spawning them and loading
+        # their models is paid once, rebuilt when the settings change
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_key = None
+        
+        # Futures of the running process_folder call, used to cancel queued work
+        self._futures: Optional[List[Future]] = None
+        
+        # Processed count and time of the last progress report
+        self._reported_count = 0
+        self._reported_at = 0.0
+        
     def process_folder(self, 
                        folder_path: Union[str, Path], 
                        actions: List[str] = None, 
                        recursive: bool = False,
                        max_workers: int = 2,  # Reduced workers to prevent memory issues
-                       progress_callback: Callable[[int, int, Dict[str, Any]], None] = None) -> Tuple[pd.DataFrame, List[str]]:
+                       progress_callback: Callable[[int, int, Dict[str, Any]], None] = None,
+                       use_processes: bool = False,
+                       batch_size: int = 16,
+                       quantized: Optional[bool] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
         """
         Process all images in a folder.
         
+        In thread mode results are looked up in and added to the result cache, if any.
+        
         Args:
             folder_path: Path to the folder containing images
             actions: List of analysis actions to perform
             recursive: Whether to search recursively in subfolders
-            max_workers: Maximum number of worker threads
-            progress_callback: Callback for progress updates
+            max_workers: Number of detection threads, or of worker processes with use_processes
+            progress_callback: Callback for progress updates, the info dictionary it
+                receives is reused between calls
+            use_processes: Whether to analyze in worker processes instead of threads.
+                This sidesteps the GIL but every process loads its own copy of the models.
+                The processes are kept for later runs until close is called.
+            batch_size: Number of images the attribute models run on at once
+            quantized: Whether to run the attribute models with int8 quantized weights,
+                None keeps the current setting
             
         Returns:
-            Tuple[pd.DataFrame, List[str]]: DataFrame of results and list of failed files
+            Tuple[List[Dict[str, Any]], List[str]]: List of results and list of failed files,
+                use to_dataframe when a DataFrame is needed
         """
         self.processing = True
         self.cancel_flag = False
@@ -54,112 +262,440 @@ class BatchProcessor:
         if isinstance(folder_path, str):
             folder_path = Path(folder_path)
             
-        if not folder_path.exists() or not folder_path.is_dir():
+        if not folder_path.is_dir():
             self.processing = False
-            return pd.DataFrame(), ["Invalid folder path"]
-        
-        # Get all image files
-        image_files = []
-        if recursive:
-            for ext in ['.jpg', '.jpeg', '.png', '.bmp']:
-                image_files.extend(list(folder_path.rglob(f"*{ext}")))
-                image_files.extend(list(folder_path.rglob(f"*{ext.upper()}")))
-        else:
-            for ext in ['.jpg', '.jpeg', '.png', '.bmp']:
-                image_files.extend(list(folder_path.glob(f"*{ext}")))
-                image_files.extend(list(folder_path.glob(f"*{ext.upper()}")))
+            return [], ["Invalid folder path"]
+            
+        if quantized is not None:
+            set_quantized_models(quantized)
+        
+        # Get all image files in a single directory scan
+        image_files = find_image_files(folder_path, recursive)
                 
         total_files = len(image_files)
         if total_files == 0:
             self.processing = False
-            return pd.DataFrame(), ["No image files found"]
+            return [], ["No image files found"]
         
         # Initialize progress
         processed_count = 0
+        self._reported_count = processed_count
+        self._reported_at = time.monotonic()
         if self.progress_callback:
             self.progress_callback(processed_count, total_files, None)
         
         results = []
         failed_files = []
         
-        # Process files in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_file = {
-                executor.submit(self._process_single_file, file_path, actions): file_path
-                for file_path in image_files
-            }
+        # Updated in place and passed to every callback, callbacks must copy what they keep
+        progress_info = {
+            'current': processed_count,
+            'total': total_files,
+            'success': 0,
+            'failed': 0
+        }
+        
+        if use_processes:
+            self._process_in_workers(image_files, actions, max_workers, batch_size, results, failed_files, progress_info)
+        else:
+            self._process_pipelined(image_files, actions, max_workers, batch_size, results, failed_files, progress_info)
+        
+        self.processing = False
+        return results, failed_files
+    
+    def _record_batch(self, 
+                      batch: List[str], 
+                      batch_results: List[Optional[Dict[str, Any]]],
+                      results: List[Dict[str, Any]],
+                      failed_files: List[str],
+                      progress_info: Dict[str, Any]) -> None:
+        """
+        Collect the results of a finished batch and report progress.
+        
+        Progress is reported once PROGRESS_MIN_FILES files or PROGRESS_MIN_INTERVAL
+        seconds have passed since the last report, so small batches don't call back
+        for every file.
+        
+        Args:
+            batch: Paths of the files in the batch
+            batch_results: One result per file, None where analysis failed
+            results: List the successful results are appended to
+            failed_files: List the failed files are appended to
+            progress_info: Progress dictionary updated in place
+        """
+        for file_path, result in zip(batch, batch_results):
+            if result:
+                results.append(result)
+                progress_info['success'] += 1
+            else:
+                failed_files.append(file_path)
+                progress_info['failed'] += 1
+        
+        progress_info['current'] += len(batch)
+        if not self.progress_callback:
+            return
+            
+        # Report every few files or fractions of a second, and always the last batch
+        now = time.monotonic()
+        current = progress_info['current']
+        if (current - self._reported_count >= PROGRESS_MIN_FILES
+                or now - self._reported_at >= PROGRESS_MIN_INTERVAL
+                or current == progress_info['total']):
+            self._reported_count = current
+            self._reported_at = now
+            self.progress_callback(current, progress_info['total'], progress_info)
+    
+    def _process_in_workers(self, 
+                            image_files: List[str], 
+                            actions: List[str],
+                            max_workers: int,
+                            batch_size: int,
+                            results: List[Dict[str, Any]],
+                            failed_files: List[str],
+                            progress_info: Dict[str, Any]) -> None:
+        """
+        Analyze the files in batches on a pool of worker processes.
+        
+        Args:
+            image_files: Paths of the files to analyze
+            actions: List of analysis actions to perform
+            max_workers: Number of worker processes
+            batch_size: Number of files handed to a worker at once
+            results: List the successful results are appended to
+            failed_files: List the failed files are appended to
+            progress_info: Progress dictionary updated in place
+        """
+        executor = self._prepare_process_pool(max_workers)
+        
+        # Split the files into batches
+        batches = [image_files[i:i + batch_size] for i in range(0, len(image_files), batch_size)]
+        
+        future_to_batch = {}
+        try:
+            for batch in batches:
+                future_to_batch[executor.submit(_process_batch_in_worker, batch, actions)] = batch
+                
+            # Only expose the futures once everything is queued so a cancel
+            # can't miss the ones submitted after it
+            self._futures = list(future_to_batch)
+            if self.cancel_flag:
+                self._cancel_futures()
+                return
             
-            for future in as_completed(future_to_file):
+            for future in as_completed(future_to_batch):
                 if self.cancel_flag:
-                    # Cancel all pending tasks
-                    for f in future_to_file:
-                        f.cancel()
-                    self.processing = False
-                    return pd.DataFrame(results) if results else pd.DataFrame(), failed_files
+                    break
                 
-                file_path = future_to_file[future]
+                batch = future_to_batch[future]
                 try:
-                    result = future.result()
-                    if result:
-                        results.append(result)
-                    else:
-                        failed_files.append(str(file_path))
+                    batch_results = future.result()
+                except BrokenProcessPool:
+                    # A worker died, the pool can't be used again
+                    self.close()
+                    raise
                 except Exception as e:
-                    print(f"Error processing {file_path}: {str(e)}")
-                    failed_files.append(str(file_path))
+                    logger.warning("Error processing batch starting at %s: %s", batch[0], e)
+                    batch_results = [None] * len(batch)
+                    
+                self._record_batch(batch, batch_results, results, failed_files, progress_info)
+        finally:
+            # The pool stays up, only this run's queued batches are dropped. After
+            # a cancel the batches still running finish in the background.
+            for future in future_to_batch:
+                future.cancel()
+            self._futures = None
+    
+    def _prepare_process_pool(self, size: int) -> ProcessPoolExecutor:
+        """
+        Get the pool of worker processes, starting it if needed.
+        
+        Args:
+            size: Number of worker processes
+            
+        Returns:
+            ProcessPoolExecutor: The worker pool
+        """
+        key = (
+            size,
+            self.face_analyzer.detector_backend,
+            self.face_analyzer.enforce_detection,
+            self.face_analyzer.align,
+            quantized_models_enabled()
+        )
+        if self._process_pool is not None and self._process_pool_key == key:
+            return self._process_pool
+            
+        self.close()
+        
+        # Spawn rather than fork, forking a process that has TensorFlow loaded can deadlock
+        self._process_pool = ProcessPoolExecutor(
+            max_workers=size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=key[1:]
+        )
+        self._process_pool_key = key
+        return self._process_pool
+    
+    def _process_pipelined(self, 
+                           image_files: List[str], 
+                           actions: List[str],
+                           max_workers: int,
+                           batch_size: int,
+                           results: List[Dict[str, Any]],
+                           failed_files: List[str],
+                           progress_info: Dict[str, Any]) -> None:
+        """
+        Analyze the files with detection and inference running as a pipeline.
+        
+        Detection threads decode each file and prepare its face, feeding a bounded
+        queue. The calling thread takes batches of prepared faces off the queue and
+        runs the attribute models once per batch, so decoding and detection overlap
+        with inference.
+        
+        Args:
+            image_files: Paths of the files to analyze
+            actions: List of analysis actions to perform
+            max_workers: Number of detection threads
+            batch_size: Number of faces passed to the models at once
+            results: List the successful results are appended to
+            failed_files: List the failed files are appended to
+            progress_info: Progress dictionary updated in place
+        """
+        # One analyzer per detection thread, reused across files
+        self._prepare_analyzer_pool(max_workers)
+        
+        # Read files ahead on separate threads so detection doesn't block on disk
+        prefetcher = ImagePrefetcher(image_files, queue_depth=max(PREFETCH_DEPTH, 2 * batch_size))
+        
+        file_queue = queue.Queue()
+        for file_path in image_files:
+            file_queue.put(file_path)
+            
+        # Bounded so detection can't run arbitrarily far ahead of inference
+        face_queue = queue.Queue(maxsize=2 * batch_size)
+        
+        for _ in range(max_workers):
+            worker = threading.Thread(
+                target=self._detect_files,
+                args=(file_queue, face_queue, prefetcher, actions),
+                daemon=True
+            )
+            worker.start()
+            
+        try:
+            batch = []
+            for received in range(1, len(image_files) + 1):
+                item = self._queue_get(face_queue)
+                if item is None:
+                    break
+                batch.append(item)
                 
-                processed_count += 1
-                if self.progress_callback:
-                    progress_info = {
-                        'current': processed_count,
-                        'total': total_files,
-                        'success': len(results),
-                        'failed': len(failed_files)
-                    }
-                    self.progress_callback(processed_count, total_files, progress_info)
+                if len(batch) == batch_size or received == len(image_files):
+                    self._record_batch(
+                        [item[0] for item in batch],
+                        self._analyze_detected(batch, actions),
+                        results, failed_files, progress_info
+                    )
+                    batch = []
+        finally:
+            prefetcher.close()
+    
+    def _detect_files(self, 
+                      file_queue: queue.Queue, 
+                      face_queue: queue.Queue, 
+                      prefetcher: ImagePrefetcher,
+                      actions: List[str]) -> None:
+        """
+        Detection thread: decode files and prepare their faces until the file queue is empty.
         
-        self.processing = False
-        return pd.DataFrame(results) if results else pd.DataFrame(), failed_files
+        Files whose results are cached skip decoding and detection.
+        
+        Args:
+            file_queue: Queue of file paths to process
+            face_queue: Queue receiving (file path, detection, cache key, cached result)
+                tuples, detection is None on failure or when the result was cached
+            prefetcher: Prefetcher holding the files' contents
+            actions: List of analysis actions to perform
+        """
+        # A deepface upgrade or another engine changes the models, so results
+        # cached with different ones are not reused
+        cache_settings = (
+            self.face_analyzer.detector_backend,
+            self.face_analyzer.enforce_detection,
+            self.face_analyzer.align,
+            quantized_models_enabled(),
+            *model_identity()
+        )
+        
+        # Check out an analyzer so no two threads share one, sharing an instance
+        # across threads can cause segmentation faults
+        local_analyzer = self._analyzer_pool.get()
+        try:
+            while not self.cancel_flag:
+                try:
+                    file_path = file_queue.get_nowait()
+                except queue.Empty:
+                    return
+                    
+                detection = None
+                cache_key = None
+                cached_result = None
+                try:
+                    data = prefetcher.get(file_path)
+                    if self.result_cache is not None and data:
+                        cache_key = ResultCache.make_key(data, actions or list(ACTION_COLUMNS), cache_settings)
+                        cached_result = self.result_cache.get(cache_key)
+                        
+                    # Large JPEGs are decoded reduced, regions are scaled back afterwards
+                    image, scale = decode_image_reduced(data) if cached_result is None else (None, 1)
+                    if image is not None:
+                        detection = local_analyzer.detect_face(image)
+                    if detection is not None and scale != 1:
+                        face, region, confidence = detection
+                        detection = (face, scale_region(region, scale), confidence)
+                except Exception as e:
+                    logger.warning("Error processing %s: %s", file_path, e)
+                    
+                if not self._queue_put(face_queue, (file_path, detection, cache_key, cached_result)):
+                    return
+        finally:
+            self._analyzer_pool.put(local_analyzer)
     
-    def _process_single_file(self, file_path: Path, actions: List[str] = None) -> Optional[Dict[str, Any]]:
+    def _analyze_detected(self, 
+                          batch: List[Tuple[str, Optional[Tuple[np.ndarray, Dict[str, Any], float]], Optional[str], Optional[Dict[str, Any]]]], 
+                          actions: List[str]) -> List[Optional[Dict[str, Any]]]:
         """
-        Process a single image file.
+        Run the attribute models over a batch of detected faces.
         
         Args:
-            file_path: Path to the image file
+            batch: (file path, detection, cache key, cached result) tuples from the detection threads
             actions: List of analysis actions to perform
             
         Returns:
-            Optional[Dict[str, Any]]: Analysis result or None if failed
+            List[Optional[Dict[str, Any]]]: One result per file, None where analysis failed
         """
-        try:
-            # Create a thread-local face analyzer for each file to avoid resource conflicts
-            # This prevents sharing the analyzer instance across threads which can cause segmentation faults
-            local_analyzer = FaceAnalyzer(
+        batch_results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        for index, (_, _, _, cached_result) in enumerate(batch):
+            batch_results[index] = cached_result
+            
+        indices = [index for index, (_, detection, _, _) in enumerate(batch) if detection is not None]
+        detections = [batch[index][1] for index in indices]
+        
+        new_entries = []
+        for index, result in zip(indices, self.face_analyzer.analyze_detections(detections, actions)):
+            if result:
+                cache_key = batch[index][2]
+                if cache_key is not None:
+                    # Cached without the file fields, the same image can live under other names
+                    new_entries.append((cache_key, dict(result)))
+                batch_results[index] = result
+                
+        if new_entries:
+            try:
+                self.result_cache.put_many(new_entries)
+            except Exception as e:
+                logger.warning("Could not update the result cache: %s", e)
+                
+        for (file_path, _, _, _), result in zip(batch, batch_results):
+            if result:
+                result['file_path'] = file_path
+                result['file_name'] = Path(file_path).name
+        return batch_results
+    
+    def _queue_put(self, target: queue.Queue, item: Any) -> bool:
+        """
+        Put an item on a bounded queue, giving up if processing is cancelled.
+        
+        Args:
+            target: The queue to put the item on
+            item: The item to put
+            
+        Returns:
+            bool: True if the item was queued, False if processing was cancelled
+        """
+        while not self.cancel_flag:
+            try:
+                target.put(item, timeout=QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _queue_get(self, source: queue.Queue) -> Optional[Any]:
+        """
+        Get an item from a queue, giving up if processing is cancelled.
+        
+        Args:
+            source: The queue to get the item from
+            
+        Returns:
+            Optional[Any]: The item or None if processing was cancelled
+        """
+        while not self.cancel_flag:
+            try:
+                return source.get(timeout=QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return None
+            
+    def _prepare_analyzer_pool(self, size: int) -> None:
+        """
+        Make sure the analyzer pool holds one analyzer per worker.
+        
+        Args:
+            size: Number of worker threads
+        """
+        key = (
+            size,
+            self.face_analyzer.detector_backend,
+            self.face_analyzer.enforce_detection,
+            self.face_analyzer.align
+        )
+        if self._analyzer_pool is not None and self._analyzer_pool_key == key:
+            return
+            
+        pool = queue.Queue()
+        for _ in range(size):
+            pool.put(FaceAnalyzer(
                 detector_backend=self.face_analyzer.detector_backend,
                 enforce_detection=self.face_analyzer.enforce_detection,
                 align=self.face_analyzer.align
-            )
-            
-            # Use the thread-local analyzer
-            result = local_analyzer.analyze_face(file_path, actions)
-            if result:
-                result['file_path'] = str(file_path)
-                result['file_name'] = file_path.name
-                return result
-            return None
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
-            return None
+            ))
+        self._analyzer_pool = pool
+        self._analyzer_pool_key = key
     
     def cancel_processing(self) -> None:
         """
         Cancel the current processing operation.
+        
+        Queued work is dropped right away, work already running finishes in the
+        background and its results are discarded.
         """
         self.cancel_flag = True
+        self._cancel_futures()
+    
+    def _cancel_futures(self) -> None:
+        """
+        Cancel the queued batches of the running process_folder call.
+        """
+        futures = self._futures
+        if futures is not None:
+            for future in futures:
+                future.cancel()
+    
+    def close(self) -> None:
+        """
+        Shut down the worker processes, they are started again by the next run that needs them.
+        """
+        pool = self._process_pool
+        self._process_pool = None
+        self._process_pool_key = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
         
     def export_results(self, 
-                       results: pd.DataFrame, 
+                       results: Results, 
                        export_path: Union[str, Path], 
                        format: str = 'csv',
                        include_failed: bool = True,
@@ -168,9 +704,9 @@ class BatchProcessor:
         Export analysis results to a file.
         
         Args:
-            results: DataFrame of results
+            results: List of result dictionaries or a DataFrame of results
             export_path: Path to export the results to
-            format: Export format ('csv' or 'json')
+            format: Export format ('csv', 'json' or 'ndjson')
             include_failed: Whether to include failed files in the export
             failed_files: List of files that failed analysis
             
@@ -180,52 +716,15 @@ class BatchProcessor:
         if isinstance(export_path, str):
             export_path = Path(export_path)
             
-        ensure_directory_exists(export_path)
-        
         timestamp = time.strftime("%Y%m%d-%H%M%S")
         
-        if format.lower() == 'csv':
-            file_path = export_path / f"face_analysis_{timestamp}.csv"
-            
-            # Export results
-            if not results.empty:
-                results.to_csv(file_path, index=False)
-                
-                # Append failed files if requested
-                if include_failed and failed_files:
-                    with open(file_path, 'a', newline='') as f:
-                        writer = csv.writer(f)
-                        writer.writerow([])
-                        writer.writerow(["Failed Files"])
-                        for failed_file in failed_files:
-                            writer.writerow([failed_file])
-            elif include_failed and failed_files:
-                with open(file_path, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Failed Files"])
-                    for failed_file in failed_files:
-                        writer.writerow([failed_file])
-            else:
-                with open(file_path, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["No results found"])
-                    
-        elif format.lower() == 'json':
-            file_path = export_path / f"face_analysis_{timestamp}.json"
-            
-            export_data = {}
-            if not results.empty:
-                export_data["results"] = results.to_dict(orient='records')
-                
-            if include_failed and failed_files:
-                export_data["failed_files"] = failed_files
-                
-            if not export_data:
-                export_data["message"] = "No results found"
-                
-            with open(file_path, 'w') as f:
-                json.dump(export_data, f, indent=4)
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
-            
-        return str(file_path)
+        # The exporter writes result lists as they are, a DataFrame is converted once
+        exporter = Exporter(export_path)
+        return exporter.export_results(
+            results,
+            export_format=format,
+            export_path=export_path,
+            filename=f"face_analysis_{timestamp}.{format.lower()}",
+            include_failed=include_failed,
+            failed_files=failed_files
+        )
@@ -2,17 +2,51 @@
 Camera module for handling webcam access and image capture.
 """
 import cv2
+import os
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional, Callable, Any, List, Dict
 from pathlib import Path
 import numpy as np
 from PIL import Image, ImageTk
 
+# Whether preview conversion runs on an OpenCL device through cv2.UMat
+USE_OPENCL = cv2.ocl.haveOpenCL()
+
+# Number of earlier frames kept around for reuse by the capture thread, enough
+# that some stay free while the camera view holds its last few frames
+MAX_SPARE_FRAMES = 6
+
+# Above this many pixels per frame, cameras are asked for MJPG. Uncompressed
+# YUYV can't carry more than about 640x480 at 30 FPS over USB 2
+MJPG_MIN_PIXELS = 640 * 480
+
+# How long a probed camera list is reused, probing has to open every device
+CAMERA_LIST_TTL = 30.0
+
+def _list_only_refcount() -> int:
+    """
+    Measure what sys.getrefcount reports for an object held only by a list.
+    
+    Interpreters differ in whether the call itself adds a reference.
+    
+    Returns:
+        int: The reference count of a list element with no other owners
+    """
+    items = [object()]
+    return sys.getrefcount(items[0])
+
+_LIST_ONLY_REFCOUNT = _list_only_refcount()
+
 class Camera:
     """
     Class for handling camera operations.
     """
+    # Last probed camera list as (time, max_cameras, cameras)
+    _camera_list: Optional[Tuple[float, int, List[Dict[str, Any]]]] = None
+    
     def __init__(self, camera_id: int = 0, width: int = 640, height: int = 480):
         """
         Initialize the camera.
@@ -30,6 +64,11 @@ class Camera:
         self.thread = None
         self.frame = None
         self.lock = threading.Lock()
+        
+        # Signalled whenever a new frame is published, counted by frame_id
+        self.frame_ready = threading.Condition(self.lock)
+        self.frame_id = 0
+        self._waited_frame_id = 0
     
     def start(self) -> bool:
         """
@@ -42,13 +81,23 @@ class Camera:
             return True
         
         try:
-            self.cap = cv2.VideoCapture(self.camera_id)
+            self.cap = self._open_capture(self.camera_id)
             if not self.cap.isOpened():
                 return False
             
+            # The format has to be chosen before the size for the driver to offer it
+            if self.width * self.height > MJPG_MIN_PIXELS:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
             
+            # Drivers fall back to the nearest mode they support, keep what was negotiated
+            self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or self.width
+            self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or self.height
+            
+            # Keep the driver queue short so reads return the freshest frame
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
             self.running = True
             self.thread = threading.Thread(target=self._update_frame)
             self.thread.daemon = True
@@ -66,6 +115,11 @@ class Camera:
         Stop the camera.
         """
         self.running = False
+        
+        # Wake any consumers waiting for a frame that won't come
+        with self.frame_ready:
+            self.frame_ready.notify_all()
+            
         if self.thread is not None:
             if self.thread.is_alive():
                 self.thread.join(timeout=1.0)
@@ -78,26 +132,69 @@ class Camera:
     def _update_frame(self) -> None:
         """
         Update the current frame continuously.
+        
+        cap.read blocks until the driver delivers a frame, so this runs at the
+        camera's own frame rate. Reads reuse the memory of earlier frames once no
+        consumer holds a reference to them, so steady-state capture doesn't
+        allocate a new frame every read.
         """
+        cap = self.cap
+        spares: List[np.ndarray] = []
         while self.running:
-            if self.cap is not None and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret:
-                    with self.lock:
-                        self.frame = frame
-            time.sleep(0.03)  # ~30 FPS
+            # A free buffer is referenced by nothing but the spares list
+            buffer = None
+            for index in range(len(spares)):
+                if sys.getrefcount(spares[index]) <= _LIST_ONLY_REFCOUNT:
+                    buffer = spares.pop(index)
+                    buffer.flags.writeable = True
+                    break
+                
+            ret, frame = cap.read(buffer)
+            if not ret:
+                # Back off briefly instead of spinning on a failing device
+                if buffer is not None:
+                    spares.append(buffer)
+                time.sleep(0.01)
+                continue
+                
+            # Published frames are shared with consumers, make accidental writes fail
+            frame.flags.writeable = False
+            with self.frame_ready:
+                previous, self.frame = self.frame, frame
+                self.frame_id += 1
+                self.frame_ready.notify_all()
+                
+            if previous is not None:
+                spares.append(previous)
+                if len(spares) > MAX_SPARE_FRAMES:
+                    spares.pop(0)
+            previous = None
+            buffer = None
+            frame = None
     
-    def get_frame(self) -> Optional[np.ndarray]:
+    def get_frame(self, wait_new: bool = False, timeout: float = 1.0) -> Optional[np.ndarray]:
         """
         Get the current frame.
         
+        The frame is shared rather than copied and is read-only, copy it before
+        modifying it.
+        
+        Args:
+            wait_new: Whether to wait for a frame newer than the last one returned with wait_new
+            timeout: Maximum time in seconds to wait for a new frame
+            
         Returns:
             Optional[np.ndarray]: The current frame or None if no frame is available
         """
-        with self.lock:
-            if self.frame is not None:
-                return self.frame.copy()
-        return None
+        with self.frame_ready:
+            if wait_new:
+                self.frame_ready.wait_for(
+                    lambda: not self.running or self.frame_id != self._waited_frame_id,
+                    timeout=timeout
+                )
+                self._waited_frame_id = self.frame_id
+                
+            return self.frame
     
     def capture_image(self) -> Optional[np.ndarray]:
         """
@@ -108,16 +205,29 @@ class Camera:
         """
         return self.get_frame()
     
-    def get_tk_image(self, frame: Optional[np.ndarray] = None, size: Optional[Tuple[int, int]] = None) -> Optional[ImageTk.PhotoImage]:
+    def get_pil_image(self, frame: Optional[np.ndarray] = None, size: Optional[Tuple[int, int]] = None,
+                      rgb_out: Optional[np.ndarray] = None,
+                      resized_out: Optional[np.ndarray] = None,
+                      interpolation: int = cv2.INTER_LANCZOS4) -> Optional[Image.Image]:
         """
-        Convert a frame to a Tkinter-compatible image.
+        Convert a frame to an RGB PIL image.
+        
+        Without OpenCL, the conversion writes into the given buffers when their
+        shape matches, so a caller converting frame after frame doesn't allocate
+        new arrays each time. A 3 channel rgb_out gives an RGB image with its own
+        copy of the pixels. A 4 channel rgb_out gives an RGBA image that shares
+        rgb_out's memory, which saves Pillow's copy but leaves rgb_out in use
+        for as long as the image is.
         
         Args:
             frame: The frame to convert (if None, the current frame is used)
             size: The size to resize the image to (if None, no resizing is done)
+            rgb_out: Preallocated (height, width, 3 or 4) array for the converted image
+            resized_out: Preallocated array of the output shape for the resized BGR image
+            interpolation: The OpenCV interpolation used when resizing
             
         Returns:
-            Optional[ImageTk.PhotoImage]: The converted image or None if conversion failed
+            Optional[Image.Image]: The converted image or None if conversion failed
         """
         if frame is None:
             frame = self.get_frame()
@@ -126,17 +236,59 @@ class Camera:
             return None
         
         try:
-            # Convert from BGR (OpenCV format) to RGB (PIL format)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(frame_rgb)
+            if not USE_OPENCL:
+                if size is not None and frame.shape[1::-1] != tuple(size):
+                    if resized_out is not None and resized_out.shape[1::-1] == tuple(size):
+                        frame = cv2.resize(frame, size, dst=resized_out, interpolation=interpolation)
+                    else:
+                        frame = cv2.resize(frame, size, interpolation=interpolation)
+                        
+                # Convert from BGR (OpenCV format) to RGB (PIL format). Letting Pillow
+                # swap the channels with its 'BGR' raw decoder skips this pass but is
+                # slower overall, its unpacker is no match for cvtColor's SIMD loop
+                height, width = frame.shape[:2]
+                if rgb_out is not None and rgb_out.shape == (height, width, 4):
+                    # Pillow maps 4 byte pixels in place instead of copying them
+                    frame_rgba = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=rgb_out)
+                    return Image.frombuffer('RGBA', (width, height), frame_rgba, 'raw', 'RGBA', 0, 1)
+                if rgb_out is not None and rgb_out.shape == frame.shape:
+                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_out)
+                else:
+                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                return Image.frombuffer('RGB', (width, height), frame_rgb, 'raw', 'RGB', 0, 1)
+                
+            # Run the resize and color conversion through OpenCL when a device is
+            # available, only the small result is downloaded to host memory
+            image = cv2.UMat(frame)
             
+            # Resize before converting so the conversion touches fewer pixels
             if size is not None:
-                pil_img = pil_img.resize(size, Image.LANCZOS)
+                image = cv2.resize(image, size, interpolation=interpolation)
             
-            return ImageTk.PhotoImage(pil_img)
+            # Convert from BGR (OpenCV format) to RGB (PIL format)
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            frame_rgb = image.get()
+            height, width = frame_rgb.shape[:2]
+            return Image.frombuffer('RGB', (width, height), frame_rgb, 'raw', 'RGB', 0, 1)
         except Exception:
             return None
     
+    def get_tk_image(self, frame: Optional[np.ndarray] = None, size: Optional[Tuple[int, int]] = None) -> Optional[ImageTk.PhotoImage]:
+        """
+        Convert a frame to a Tkinter-compatible image.
+        
+        Args:
+            frame: The frame to convert (if None, the current frame is used)
+            size: The size to resize the image to (if None, no resizing is done)
+            
+        Returns:
+            Optional[ImageTk.PhotoImage]: The converted image or None if conversion failed
+        """
+        pil_img = self.get_pil_image(frame, size)
+        if pil_img is None:
+            return None
+        return ImageTk.PhotoImage(pil_img)
+    
     def save_image(self, image: np.ndarray, file_path: Path) -> bool:
         """
         Save an image to a file.
@@ -161,45 +313,106 @@ class Camera:
         self.stop()
         
     @staticmethod
-    def get_available_cameras(max_cameras: int = 10) -> List[Dict[str, any]]:
+    def _open_capture(camera_id: int) -> cv2.VideoCapture:
         """
-        Get a list of available cameras.
+        Open a camera with the capture backend that suits the platform.
         
         Args:
-            max_cameras: Maximum number of cameras to check
+            camera_id: The camera ID to open
             
         Returns:
-            List of dictionaries containing camera information
+            cv2.VideoCapture: The capture, check isOpened for success
+        """
+        # DirectShow opens much faster than the default Media Foundation backend on
+        # Windows, and probing and capturing through the same backend keeps the
+        # camera indices consistent
+        if sys.platform == "win32":
+            return cv2.VideoCapture(camera_id, cv2.CAP_DSHOW)
+        return cv2.VideoCapture(camera_id)
+        
+    @staticmethod
+    def _probe_camera(camera_id: int) -> Optional[Dict[str, Any]]:
         """
-        available_cameras = []
+        Check whether a camera index can be opened.
         
-        # Try to open each camera index and check if it works
-        for i in range(max_cameras):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                # Get camera name if possible
-                camera_name = f"Camera {i}"
+        Args:
+            camera_id: The camera ID to check
+            
+        Returns:
+            Optional[Dict[str, Any]]: The camera information or None if it couldn't be opened
+        """
+        cap = Camera._open_capture(camera_id)
+        try:
+            if not cap.isOpened():
+                return None
                 
-                # On some systems, we can get the camera name
-                try:
-                    # This might not work on all platforms
-                    backend = cv2.CAP_ANY
-                    camera_name = cap.getBackendName()
-                    if not camera_name:
-                        camera_name = f"Camera {i}"
-                except:
-                    pass
+            # On some systems, we can get the camera name
+            camera_name = f"Camera {camera_id}"
+            try:
+                # This might not work on all platforms
+                camera_name = cap.getBackendName() or camera_name
+            except Exception:
+                pass
                 
-                available_cameras.append({
-                    "id": i,
-                    "name": camera_name
-                })
+            return {
+                "id": camera_id,
+                "name": camera_name
+            }
+        finally:
+            cap.release()
+    
+    @staticmethod
+    def _camera_candidates(max_cameras: int) -> List[int]:
+        """
+        Get the camera indices worth probing.
+        
+        Args:
+            max_cameras: Maximum number of cameras to check
+            
+        Returns:
+            List[int]: Camera indices to probe
+        """
+        # Linux lists its capture devices as /dev/videoN
+        if sys.platform.startswith("linux"):
+            try:
+                with os.scandir("/dev") as entries:
+                    indices = sorted(
+                        int(entry.name[5:]) for entry in entries
+                        if entry.name.startswith("video") and entry.name[5:].isdigit()
+                    )
+                return [index for index in indices if index < max_cameras]
+            except OSError:
+                pass
                 
-                # Release the camera
-                cap.release()
-            else:
-                # If we can't open this index, we've likely reached the end of available cameras
-                if i > 0:  # Skip breaking on the first camera to handle cases where camera 0 is not available
-                    break
+        return list(range(max_cameras))
+        
+    @staticmethod
+    def get_available_cameras(max_cameras: int = 10, refresh: bool = False) -> List[Dict[str, any]]:
+        """
+        Get a list of available cameras.
         
-        return available_cameras
+        A list probed in the last CAMERA_LIST_TTL seconds is reused unless a
+        refresh is asked for.
+        
+        Args:
+            max_cameras: Maximum number of cameras to check
+            refresh: Whether to probe the cameras again regardless of the last list
+            
+        Returns:
+            List of dictionaries containing camera information
+        """
+        cached = Camera._camera_list
+        if (not refresh and cached is not None and cached[1] == max_cameras
+                and time.monotonic() - cached[0] < CAMERA_LIST_TTL):
+            return list(cached[2])
+            
+        candidates = Camera._camera_candidates(max_cameras)
+        cameras = []
+        if candidates:
+            # Opening a camera mostly waits on the driver, so probe them all at once
+            with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as executor:
+                probes = list(executor.map(Camera._probe_camera, candidates))
+            cameras = [camera for camera in probes if camera is not None]
+            
+        Camera._camera_list = (time.monotonic(), max_cameras, cameras)
+        return list(cameras)
@@ -4,12 +4,222 @@ Export module for exporting analysis results.
 from pathlib import Path
 import pandas as pd
 import json
+import os
 import csv
+import io
+import operator
+import gzip
+import bz2
+import lzma
 import time
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, BinaryIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from src.utils.helpers import ensure_directory_exists, generate_timestamp_filename
 
+# Write buffer for exported files, large exports are written in few system calls
+EXPORT_BUFFER_SIZE = 4 << 20
+
+# File suffix written for each supported CSV compression
+COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'bz2': '.bz2',
+    'xz': '.xz',
+    'zstd': '.zst'
+}
+
+Results = Union[List[Dict[str, Any]], pd.DataFrame]
+
+def results_to_records(results: Optional[Results]) -> List[Dict[str, Any]]:
+    """
+    Normalize analysis results to a list of row dictionaries.
+    
+    Args:
+        results: List of result dictionaries or a DataFrame of results
+        
+    Returns:
+        List[Dict[str, Any]]: One dictionary per result row
+    """
+    if results is None:
+        return []
+    if isinstance(results, pd.DataFrame):
+        return results.to_dict(orient='records')
+    return results
+
+def sync_file(f: Any) -> None:
+    """
+    Flush a file and wait until the operating system has written it to disk.
+    
+    Args:
+        f: The open file
+    """
+    f.flush()
+    os.fsync(f.fileno())
+
+def infer_compression(file_path: Union[str, Path]) -> Optional[str]:
+    """
+    Infer the compression of an export file from its suffix.
+    
+    Args:
+        file_path: Path of the export file
+        
+    Returns:
+        Optional[str]: The compression name or None for an uncompressed file
+    """
+    suffix = Path(file_path).suffix.lower()
+    for compression, compression_suffix in COMPRESSION_SUFFIXES.items():
+        if suffix == compression_suffix:
+            return compression
+    return None
+
+def _compressed_writer(raw: BinaryIO, compression: Optional[str]) -> BinaryIO:
+    """
+    Wrap a binary file in a compressing writer that leaves the file open when closed.
+    
+    Args:
+        raw: The open binary file
+        compression: The compression to use, None to write the file as is
+        
+    Returns:
+        BinaryIO: A writable binary stream
+    """
+    if compression is None:
+        return raw
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)
+    if compression == 'bz2':
+        return bz2.BZ2File(raw, mode='wb')
+    if compression == 'xz':
+        return lzma.LZMAFile(raw, mode='wb')
+    return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+
+def write_results_csv(file_path: Union[str, Path],
+                      records: List[Dict[str, Any]],
+                      failed_files: Optional[List[str]] = None,
+                      flush_durability: bool = False,
+                      compression: Optional[str] = None) -> None:
+    """
+    Write result rows and an optional failed files section to a CSV file in one pass.
+    
+    Args:
+        file_path: Path of the CSV file to write
+        records: List of result dictionaries
+        failed_files: List of failed files to list after the results
+        flush_durability: Whether to fsync the file before returning
+        compression: Compression to write the file with ('gzip', 'bz2', 'xz' or 'zstd'),
+            'infer' to pick it from the file suffix, or None
+    """
+    if compression == 'infer':
+        compression = infer_compression(file_path)
+        
+    # Check before creating the file so a bad option doesn't leave an empty export
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression: {compression}")
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+        
+    with open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as raw:
+        stream = _compressed_writer(raw, compression)
+        f = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        writer = csv.writer(f)
+        
+        if records:
+            # Union of the keys in row order, results can differ in their fields
+            fieldnames = list(dict.fromkeys(key for record in records for key in record))
+            writer.writerow(fieldnames)
+            
+            # Plain csv.writer rows, DictWriter re-checks every record's keys in Python
+            if len(fieldnames) > 1 and all(len(record) == len(fieldnames) for record in records):
+                # Every record has every field, fetch them all in one C call per row
+                writer.writerows(map(operator.itemgetter(*fieldnames), records))
+            else:
+                writer.writerows([record.get(key, '') for key in fieldnames] for record in records)
+            
+            if failed_files:
+                writer.writerow([])
+                
+        # Failed files go into the same stream, so compressed files need no second pass
+        if failed_files:
+            writer.writerow(["Failed Files"])
+            writer.writerows([failed_file] for failed_file in failed_files)
+        elif not records:
+            writer.writerow(["No results found"])
+            
+        # Flush the text layer, then finish the compressed stream into the file
+        f.detach()
+        if stream is not raw:
+            stream.close()
+            
+        if flush_durability:
+            sync_file(raw)
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    Serialize an object to compact JSON, using orjson when it is installed.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj).encode('utf-8')
+
+def _json_default(value: Any) -> Any:
+    """
+    Convert a value the JSON encoder doesn't know, such as a numpy scalar or array.
+    
+    Args:
+        value: The value to convert
+        
+    Returns:
+        Any: The equivalent plain Python value
+    """
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def json_bytes(obj: Any) -> bytes:
+    """
+    Serialize an object to indented UTF-8 JSON for a sidecar file.
+    
+    Uses orjson when it is installed, which encodes numpy values natively.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        bytes: The indented JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=4, default=_json_default).encode('utf-8')
+
+def format_json(obj: Any) -> str:
+    """
+    Serialize an object to indented JSON for display.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        str: The indented JSON text
+    """
+    if orjson is not None:
+        return json_bytes(obj).decode('utf-8')
+    return json.dumps(obj, indent=4, default=_json_default)
+
 class Exporter:
     """
     Class for exporting analysis results.
@@ -25,20 +235,27 @@ class Exporter:
         ensure_directory_exists(self.default_export_path)
         
     def export_to_csv(self, 
-                     results: pd.DataFrame, 
+                     results: Results, 
                      export_path: Optional[Path] = None,
                      filename: Optional[str] = None,
                      include_failed: bool = True,
-                     failed_files: Optional[List[str]] = None) -> str:
+                     failed_files: Optional[List[str]] = None,
+                     flush_durability: bool = False,
+                     compression: Optional[str] = None) -> str:
         """
         Export results to CSV.
         
         Args:
-            results: DataFrame of results
+            results: List of result dictionaries or a DataFrame of results
             export_path: Path to export the file to
             filename: Name of the export file
             include_failed: Whether to include failed files
             failed_files: List of failed files
+            flush_durability: Whether to fsync the file before returning, exports are
+                otherwise left to the operating system to write back
+            compression: Compression to write the file with ('gzip', 'bz2', 'xz' or 'zstd'),
+                'infer' to pick it from the filename, or None. Generated filenames get
+                the matching suffix.
             
         Returns:
             str: Path to the exported file
@@ -48,49 +265,36 @@ class Exporter:
         
         if filename is None:
             filename = generate_timestamp_filename("face_analysis", "csv")
+            if compression not in (None, 'infer'):
+                filename += COMPRESSION_SUFFIXES.get(compression, '')
             
         file_path = export_path / filename
+        records = results_to_records(results)
         
-        # Export results
-        if not results.empty:
-            results.to_csv(file_path, index=False)
-            
-            # Append failed files if requested
-            if include_failed and failed_files:
-                with open(file_path, 'a', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([])
-                    writer.writerow(["Failed Files"])
-                    for failed_file in failed_files:
-                        writer.writerow([failed_file])
-        elif include_failed and failed_files:
-            with open(file_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["Failed Files"])
-                for failed_file in failed_files:
-                    writer.writerow([failed_file])
-        else:
-            with open(file_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["No results found"])
+        write_results_csv(
+            file_path, records, failed_files if include_failed else None, flush_durability, compression
+        )
                 
         return str(file_path)
     
     def export_to_json(self, 
-                      results: pd.DataFrame, 
+                      results: Results, 
                       export_path: Optional[Path] = None,
                       filename: Optional[str] = None,
                       include_failed: bool = True,
-                      failed_files: Optional[List[str]] = None) -> str:
+                      failed_files: Optional[List[str]] = None,
+                      flush_durability: bool = False) -> str:
         """
         Export results to JSON.
         
         Args:
-            results: DataFrame of results
+            results: List of result dictionaries or a DataFrame of results
             export_path: Path to export the file to
             filename: Name of the export file
             include_failed: Whether to include failed files
             failed_files: List of failed files
+            flush_durability: Whether to fsync the file before returning, exports are
+                otherwise left to the operating system to write back
             
         Returns:
             str: Path to the exported file
@@ -103,49 +307,116 @@ class Exporter:
             
         file_path = export_path / filename
         
-        export_data = {}
-        if not results.empty:
-            export_data["results"] = results.to_dict(orient='records')
+        records = results_to_records(results)
+        include_failed = include_failed and bool(failed_files)
+        
+        # Stream one record per line instead of building the whole document in memory
+        with open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+            f.write(b'{')
             
-        if include_failed and failed_files:
-            export_data["failed_files"] = failed_files
+            if records:
+                f.write(b'\n"results": [')
+                for index, record in enumerate(records):
+                    f.write(b'\n' if index == 0 else b',\n')
+                    f.write(dumps_json(record))
+                f.write(b'\n]')
+                
+            if include_failed:
+                f.write(b',' if records else b'')
+                f.write(b'\n"failed_files": ' + dumps_json(failed_files))
+                
+            if not records and not include_failed:
+                f.write(b'\n"message": "No results found"')
+                
+            f.write(b'\n}\n')
             
-        if not export_data:
-            export_data["message"] = "No results found"
+            if flush_durability:
+                sync_file(f)
+                
+        return str(file_path)
+    
+    def export_to_ndjson(self, 
+                        results: Results, 
+                        export_path: Optional[Path] = None,
+                        filename: Optional[str] = None,
+                        include_failed: bool = True,
+                        failed_files: Optional[List[str]] = None,
+                        flush_durability: bool = False) -> str:
+        """
+        Export results as newline-delimited JSON, one result object per line.
+        
+        Failed files are written after the results as {"failed_file": path} lines.
+        
+        Args:
+            results: List of result dictionaries or a DataFrame of results
+            export_path: Path to export the file to
+            filename: Name of the export file
+            include_failed: Whether to include failed files
+            failed_files: List of failed files
+            flush_durability: Whether to fsync the file before returning, exports are
+                otherwise left to the operating system to write back
+            
+        Returns:
+            str: Path to the exported file
+        """
+        export_path = export_path or self.default_export_path
+        ensure_directory_exists(export_path)
+        
+        if filename is None:
+            filename = generate_timestamp_filename("face_analysis", "ndjson")
             
-        with open(file_path, 'w') as f:
-            json.dump(export_data, f, indent=4)
+        file_path = export_path / filename
+        
+        with open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+            for record in results_to_records(results):
+                f.write(dumps_json(record) + b'\n')
+                
+            if include_failed and failed_files:
+                for failed_file in failed_files:
+                    f.write(dumps_json({"failed_file": failed_file}) + b'\n')
+                    
+            if flush_durability:
+                sync_file(f)
                 
         return str(file_path)
     
     def export_results(self, 
-                      results: pd.DataFrame, 
+                      results: Results, 
                       export_format: str = 'csv',
                       export_path: Optional[Path] = None,
                       filename: Optional[str] = None,
                       include_failed: bool = True,
-                      failed_files: Optional[List[str]] = None) -> str:
+                      failed_files: Optional[List[str]] = None,
+                      flush_durability: bool = False,
+                      compression: Optional[str] = None) -> str:
         """
         Export results in the specified format.
         
         Args:
-            results: DataFrame of results
-            export_format: Format to export to ('csv' or 'json')
+            results: List of result dictionaries or a DataFrame of results
+            export_format: Format to export to ('csv', 'json' or 'ndjson')
             export_path: Path to export the file to
             filename: Name of the export file
             include_failed: Whether to include failed files
             failed_files: List of failed files
+            flush_durability: Whether to fsync the file before returning, exports are
+                otherwise left to the operating system to write back
+            compression: Compression for CSV exports, see export_to_csv
             
         Returns:
             str: Path to the exported file
         """
         if export_format.lower() == 'csv':
             return self.export_to_csv(
-                results, export_path, filename, include_failed, failed_files
+                results, export_path, filename, include_failed, failed_files, flush_durability, compression
             )
         elif export_format.lower() == 'json':
             return self.export_to_json(
-                results, export_path, filename, include_failed, failed_files
+                results, export_path, filename, include_failed, failed_files, flush_durability
+            )
+        elif export_format.lower() == 'ndjson':
+            return self.export_to_ndjson(
+                results, export_path, filename, include_failed, failed_files, flush_durability
             )
         else:
             raise ValueError(f"Unsupported export format: {export_format}")
@@ -5,32 +5,54 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
 import time
+import logging
 from pathlib import Path
 import os
 import pandas as pd
 
-from src.analysis import FaceAnalyzer
-from src.batch_processor import BatchProcessor
+from src.analysis import get_face_analyzer, quantized_models_enabled
+from src.batch_processor import BatchProcessor, to_dataframe
 from src.export import Exporter
+from src.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Minimum interval between progress redraws, about 30 per second
+PROGRESS_UPDATE_MS = 33
+
+# Detection threads feeding the batched inference, one per core up to a limit
+DETECTION_WORKERS = min(8, os.cpu_count() or 2)
 
 class BatchFrame(ttk.Frame):
     """
     Frame for batch processing images.
     """
-    def __init__(self, parent, main_window):
+    def __init__(self, parent, main_window, on_complete=None):
         """
         Initialize the batch processing frame.
         
         Args:
             parent: The parent widget
             main_window: The main application window
+            on_complete: Optional callback receiving the results and failed files
+                when a run finishes
         """
         super().__init__(parent)
         self.main_window = main_window
+        self.on_complete = on_complete
         
         # Initialize components
-        self.face_analyzer = FaceAnalyzer()
-        self.batch_processor = BatchProcessor(self.face_analyzer)
+        # Shared so rebuilding the tab reuses the analyzer and its loaded state
+        self.face_analyzer = get_face_analyzer()
+        
+        # Results of images analyzed before, unchanged images are not analyzed again
+        try:
+            self.result_cache = ResultCache()
+        except Exception as e:
+            logger.warning("Result cache unavailable: %s", e)
+            self.result_cache = None
+            
+        self.batch_processor = BatchProcessor(self.face_analyzer, self.result_cache)
         self.exporter = Exporter()
         
         # Frame state variables
@@ -38,8 +60,13 @@ class BatchFrame(ttk.Frame):
         self.folder_path = None
         self.processing_thread = None
         self.current_results = None
+        self.current_actions = None
         self.failed_files = None
         
+        # Latest progress update from the processing thread, drawn by _flush_progress
+        self._pending_progress = None
+        self._progress_scheduled = False
+        
         # Create UI components
         self._create_widgets()
         
@@ -87,6 +114,20 @@ class BatchFrame(ttk.Frame):
         )
         self.recursive_check.pack(side=tk.LEFT, padx=(0, 20))
         
+        # Batch size option, the number of images the models run on at once
+        self.batch_size_label = ttk.Label(self.processing_options, text="Batch Size:")
+        self.batch_size_label.pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.batch_size_var = tk.StringVar(value="16")
+        self.batch_size_combo = ttk.Combobox(
+            self.processing_options, 
+            textvariable=self.batch_size_var,
+            values=["1", "4", "8", "16", "32"],
+            width=4,
+            state="readonly"
+        )
+        self.batch_size_combo.pack(side=tk.LEFT)
+        
         # Analysis options
         self.analysis_options_frame = ttk.LabelFrame(self.options_frame, text="Analysis Options")
         self.analysis_options_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
@@ -125,7 +166,16 @@ class BatchFrame(ttk.Frame):
             text="Race", 
             variable=self.race_var
         )
-        self.race_check.pack(side=tk.LEFT)
+        self.race_check.pack(side=tk.LEFT, padx=(0, 20))
+        
+        # Int8 quantized attribute models, only takes effect with the ONNX backend
+        self.quantized_var = tk.BooleanVar(value=quantized_models_enabled())
+        self.quantized_check = ttk.Checkbutton(
+            self.analysis_options, 
+            text="Use quantized models (faster)", 
+            variable=self.quantized_var
+        )
+        self.quantized_check.pack(side=tk.LEFT)
         
         # Action buttons
         self.action_buttons = ttk.Frame(self.options_frame)
@@ -146,6 +196,14 @@ class BatchFrame(ttk.Frame):
         )
         self.cancel_btn.pack(side=tk.LEFT)
         
+        self.clear_cache_btn = ttk.Button(
+            self.action_buttons, 
+            text="Clear Cache", 
+            command=self.clear_cache,
+            state=tk.NORMAL if self.result_cache else tk.DISABLED
+        )
+        self.clear_cache_btn.pack(side=tk.RIGHT)
+        
         # Progress section
         self.progress_frame = ttk.LabelFrame(self, text="Processing Progress")
         self.progress_frame.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
@@ -228,8 +286,8 @@ class BatchFrame(ttk.Frame):
         self.export_format = ttk.Combobox(
             self.export_format_frame, 
             textvariable=self.export_format_var,
-            values=["csv", "json"],
-            width=5,
+            values=["csv", "json", "ndjson"],
+            width=7,
             state="readonly"
         )
         self.export_format.pack(side=tk.LEFT, padx=(0, 5))
@@ -272,7 +330,7 @@ class BatchFrame(ttk.Frame):
             return
             
         # Check if folder exists
-        if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
+        if not os.path.isdir(folder_path):
             self.main_window.show_error(
                 "Input Error", 
                 "The selected folder does not exist."
@@ -305,7 +363,13 @@ class BatchFrame(ttk.Frame):
         self.view_results_btn.config(state=tk.DISABLED)
         self.export_btn.config(state=tk.DISABLED)
         
+        # Drop the previous run's results now, so they aren't held alongside the new ones
+        self.current_results = None
+        self.current_actions = None
+        self.failed_files = None
+        
         # Reset progress indicators
+        self._pending_progress = None
         self.progress_bar['value'] = 0
         self.files_value.config(text="0/0")
         self.success_value.config(text="0")
@@ -315,12 +379,15 @@ class BatchFrame(ttk.Frame):
         # Start processing in a separate thread
         self.processing_thread = threading.Thread(
             target=self._perform_batch_processing,
-            args=(folder_path, actions, self.recursive_var.get())
+            args=(
+                folder_path, actions, self.recursive_var.get(),
+                int(self.batch_size_var.get()), self.quantized_var.get()
+            )
         )
         self.processing_thread.daemon = True
         self.processing_thread.start()
         
-    def _perform_batch_processing(self, folder_path, actions, recursive):
+    def _perform_batch_processing(self, folder_path, actions, recursive, batch_size=16, quantized=False):
         """
         Perform batch processing in a separate thread.
         
@@ -328,6 +395,8 @@ class BatchFrame(ttk.Frame):
             folder_path: Path to the folder containing images
             actions: List of analysis actions to perform
             recursive: Whether to search recursively in subfolders
+            batch_size: Number of images analyzed per model call
+            quantized: Whether to run the attribute models with quantized weights
         """
         try:
             # Process the folder
@@ -335,11 +404,15 @@ class BatchFrame(ttk.Frame):
                 folder_path=folder_path,
                 actions=actions,
                 recursive=recursive,
-                progress_callback=self._update_progress
+                max_workers=DETECTION_WORKERS,
+                progress_callback=self._update_progress,
+                batch_size=batch_size,
+                quantized=quantized
             )
             
             # Store the results
             self.current_results = results
+            self.current_actions = actions
             self.failed_files = failed
             
             # Update UI after processing
@@ -358,35 +431,46 @@ class BatchFrame(ttk.Frame):
             total: Total number of files to process
             info: Additional progress information
         """
-        # Calculate progress percentage
-        if total > 0:
-            progress = (current / total) * 100
+        # The processor reuses the info dictionary, copy the counts before handing them to Tk
+        if info:
+            success_count, failed_count = info.get('success', 0), info.get('failed', 0)
         else:
-            progress = 0
+            success_count = failed_count = None
             
-        # Update UI elements
-        self.after(0, lambda: self._update_progress_ui(current, total, progress, info))
+        # Keep only the latest update and let Tk pick it up at a fixed rate, batches
+        # can finish faster than the event loop should redraw
+        self._pending_progress = (current, total, success_count, failed_count)
+        if not self._progress_scheduled:
+            self._progress_scheduled = True
+            self.after(PROGRESS_UPDATE_MS, self._flush_progress)
+    
+    def _flush_progress(self):
+        """
+        Show the latest progress update on the Tk thread.
+        """
+        # Clear the flag before reading so an update arriving meanwhile schedules another flush
+        self._progress_scheduled = False
+        pending = self._pending_progress
+        if pending is not None:
+            self._update_progress_ui(*pending)
     
-    def _update_progress_ui(self, current, total, progress, info):
+    def _update_progress_ui(self, current, total, success_count=None, failed_count=None):
         """
         Update the progress UI elements.
         
         Args:
             current: Current number of processed files
             total: Total number of files to process
-            progress: Progress percentage
-            info: Additional progress information
+            success_count: Number of files analyzed successfully, None if not known yet
+            failed_count: Number of files that failed, None if not known yet
         """
-        # Update progress bar
-        self.progress_bar['value'] = progress
+        # Scale the bar to the file count, so the percentage never has to be computed
+        self.progress_bar.configure(maximum=max(total, 1), value=current)
         
         # Update status text
         self.files_value.config(text=f"{current}/{total}")
         
-        if info:
-            success_count = info.get('success', 0)
-            failed_count = info.get('failed', 0)
-            
+        if success_count is not None:
             self.success_value.config(text=str(success_count))
             self.failed_value.config(text=str(failed_count))
     
@@ -396,13 +480,13 @@ class BatchFrame(ttk.Frame):
         """
         # Update UI
         self.is_processing = False
-        self.status_label.config(text="Processing complete")
         self.start_btn.config(state=tk.NORMAL)
         self.cancel_btn.config(state=tk.DISABLED)
         self.browse_btn.config(state=tk.NORMAL)
         
-        # Enable result buttons if we have results
-        if self.current_results is not None and not self.current_results.empty:
+        # Enable result buttons if we have results, the summary goes in the status
+        # label rather than a modal dialog so nothing blocks the event loop
+        if self.current_results:
             self.view_results_btn.config(state=tk.NORMAL)
             self.export_btn.config(state=tk.NORMAL)
             
@@ -410,16 +494,14 @@ class BatchFrame(ttk.Frame):
             num_results = len(self.current_results)
             num_failed = len(self.failed_files) if self.failed_files else 0
             
-            messagebox.showinfo(
-                "Processing Complete",
-                f"Successfully processed {num_results} images.\n"
-                f"Failed to process {num_failed} images."
+            self.status_label.config(
+                text=f"Processing complete: {num_results} processed, {num_failed} failed"
             )
         else:
-            messagebox.showinfo(
-                "Processing Complete",
-                "No faces were detected in any of the images."
-            )
+            self.status_label.config(text="Processing complete: no faces were detected")
+            
+        if self.on_complete:
+            self.on_complete(self.current_results, self.failed_files)
     
     def _processing_error(self, error_message):
         """
@@ -455,11 +537,24 @@ class BatchFrame(ttk.Frame):
         self.status_label.config(text="Cancelling...")
         self.cancel_btn.config(state=tk.DISABLED)
     
+    def clear_cache(self):
+        """
+        Remove all cached results so every image is analyzed again.
+        """
+        if self.is_processing or not self.result_cache:
+            return
+            
+        try:
+            self.result_cache.clear()
+            messagebox.showinfo("Cache Cleared", "Cached results have been removed.")
+        except Exception as e:
+            messagebox.showerror("Cache Error", f"Error clearing cache: {str(e)}")
+    
     def view_results(self):
         """
         View the batch processing results.
         """
-        if self.current_results is None or self.current_results.empty:
+        if not self.current_results:
             self.main_window.show_error(
                 "No Results",
                 "There are no results to view."
@@ -467,13 +562,13 @@ class BatchFrame(ttk.Frame):
             return
             
         # Show results in the main window
-        self.main_window.show_results(self.current_results, self.failed_files)
+        self.main_window.show_results(to_dataframe(self.current_results, self.current_actions), self.failed_files)
     
     def export_results(self):
         """
         Export the batch processing results.
         """
-        if self.current_results is None or self.current_results.empty:
+        if not self.current_results:
             self.main_window.show_error(
                 "No Results",
                 "There are no results to export."
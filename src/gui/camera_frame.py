@@ -5,15 +5,55 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 import cv2
 import threading
+import queue
 import time
+import logging
+from collections import OrderedDict, deque
 from pathlib import Path
 import os
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
 import numpy as np
 from datetime import datetime
 
 from src.camera import Camera
 from src.analysis import FaceAnalyzer, ModelLoader
+from src.export import format_json, json_bytes
+from src.utils.helpers import average_hash, hash_distance, scale_region
+
+logger = logging.getLogger(__name__)
+
+# Interval at which the Tk thread picks up the newest camera frame
+DISPLAY_POLL_MS = 15
+
+# Number of recent frames searched for the clearest face on capture
+CAPTURE_FRAMES = 4
+
+# Analyses remembered by a hash of the detected face crop, how many bits two
+# hashes may differ by for the faces to count as the same, and for how many
+# seconds an analysis may be reused
+ANALYSIS_CACHE_SIZE = 32
+ANALYSIS_CACHE_MAX_DISTANCE = 5
+ANALYSIS_CACHE_MAX_AGE = 5.0
+
+# Frames with a longer side above this are shrunk by a whole factor before face
+# detection, the attribute models only see a 224 pixel face crop anyway
+ANALYSIS_MAX_SIDE = 1280
+
+# The opencv detector searches camera frames at this size, webcam faces are large
+# enough to find there and are still cropped from the full frame
+CAMERA_DETECTION_MAX_SIDE = 320
+
+# The live feed is searched for a face in the background every PREDETECT_INTERVAL
+# seconds, spaced out further for slow detectors so the search keeps the analysis
+# thread busy at most PREDETECT_MAX_LOAD of the time. A capture of the searched
+# frame analyzes the face found there instead of detecting again
+PREDETECT_INTERVAL = 0.2
+PREDETECT_MAX_LOAD = 0.25
+
+# Saved JPEGs use quality 90 with optimized Huffman tables, noticeably smaller
+# than libjpeg's default quality 95 with no visible difference
+SAVE_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
 
 class CameraFrame(ttk.Frame):
     """
@@ -32,20 +72,62 @@ class CameraFrame(ttk.Frame):
         
         # Initialize camera and analyzer
         self.camera = None
-        self.face_analyzer = FaceAnalyzer()
+        self._analyzers = {}  # FaceAnalyzer per detector backend, kept across switches
+        self.face_analyzer = self._get_analyzer("opencv")
         
         # Frame state variables
         self.is_camera_running = False
         self.is_analyzing = False
         self.is_image_frozen = False  # Flag to indicate if we've frozen an image
+        self._live_view = threading.Event()  # Set while the feed isn't frozen
+        self._live_view.set()
         self.current_frame = None
+        self.recent_frames = deque(maxlen=CAPTURE_FRAMES)
+        self._recent_frames_lock = threading.Lock()
+        self.captured_frames = []
         self.frozen_frame = None
         self.visualization_frame = None
+        self.visualization_result = None  # Result marked on the frame when shown or saved
         self.analysis_result = None
+        self._analysis_cache = OrderedDict()
+        
+        # Latest face found in the live feed as (analyzer, frame, detection, scale),
+        # only touched on the analysis thread, and when the next search is due
+        self._predetection = None
+        self._predetect_future = None
+        self._next_predetect = 0.0
+        
+        # Saves run in order on one background thread, analyses on another
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+        self._analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self._warm_up_future = None
         self.update_thread = None
         self.frame_update_running = False
         self.available_cameras = []
         
+        # Photo and canvas item showing the feed, reused from frame to frame
+        self._photo = None
+        self._canvas_image = None
+        self._canvas_image_center = None
+        
+        # Canvas text item summarizing the analysis over the feed, and the text
+        # last set on each result label so unchanged labels aren't laid out again
+        self._overlay_text = None
+        self._label_texts = {}
+        
+        # Newest converted frame, handed from the capture thread to the Tk thread
+        self._frame_queue = queue.Queue(maxsize=1)
+        
+        # Conversion buffers and display size reused from frame to frame by the
+        # capture thread, recomputed when the frame or canvas size changes. Preview
+        # images share the memory of an RGBA buffer, which returns to the pool once
+        # the image has been pasted or dropped
+        self._resize_buffer = None
+        self._rgba_buffers = queue.SimpleQueue()
+        self._preview_geometry = None
+        self._canvas_size = (480, 360)
+        self._display_after_id = None
+        
         # Create the UI components
         self._create_widgets()
         
@@ -117,6 +199,7 @@ class CameraFrame(ttk.Frame):
         # Camera canvas
         self.canvas = tk.Canvas(self.camera_frame, bg="black", width=480, height=360)
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.canvas.bind("<Configure>", self._on_canvas_resize)
         
         # Camera selection frame
         self.camera_select_frame = ttk.Frame(self.camera_frame)
@@ -144,7 +227,7 @@ class CameraFrame(ttk.Frame):
         self.refresh_cameras_btn.pack(side=tk.LEFT)
         
         # Populate camera dropdown
-        self._populate_camera_dropdown()
+        self._populate_camera_dropdown(refresh=False)
         
         # Camera controls frame
         self.camera_controls = ttk.Frame(self.camera_frame)
@@ -282,12 +365,42 @@ class CameraFrame(ttk.Frame):
         else:
             self.stop_camera()
             
-    def _populate_camera_dropdown(self):
+    def _populate_camera_dropdown(self, refresh=True):
         """
         Populate the camera selection dropdown with available cameras.
+        
+        Probing opens every camera, so it runs in the background and the
+        dropdown is filled in once it finishes.
+        
+        Args:
+            refresh: Whether to probe again rather than reuse a recently probed list
+        """
+        self.refresh_cameras_btn.config(state=tk.DISABLED)
+        self.camera_select_combo.set("Detecting cameras...")
+        threading.Thread(target=self._detect_cameras, args=(refresh,), daemon=True).start()
+        
+    def _detect_cameras(self, refresh):
         """
-        # Get available cameras
-        self.available_cameras = Camera.get_available_cameras()
+        Probe for cameras, runs on a background thread.
+        
+        Args:
+            refresh: Whether to probe again rather than reuse a recently probed list
+        """
+        try:
+            cameras = Camera.get_available_cameras(refresh=refresh)
+        except Exception as e:
+            logger.warning("Error detecting cameras: %s", e)
+            cameras = []
+        self.after(0, self._fill_camera_dropdown, cameras)
+        
+    def _fill_camera_dropdown(self, cameras):
+        """
+        Fill the camera selection dropdown with the detected cameras.
+        
+        Args:
+            cameras: The detected cameras
+        """
+        self.available_cameras = cameras
         
         # Create list of camera names for dropdown
         camera_names = []
@@ -302,6 +415,7 @@ class CameraFrame(ttk.Frame):
         # Update dropdown values
         self.camera_select_combo['values'] = camera_names
         self.camera_select_combo.current(0)  # Select first camera by default
+        self.refresh_cameras_btn.config(state=tk.NORMAL)
     
     def start_camera(self):
         """
@@ -330,10 +444,16 @@ class CameraFrame(ttk.Frame):
             self.capture_btn.config(state=tk.NORMAL)
             self.status_label.config(text="Camera running")
             
-            # Start the frame update thread
+            # Start the frame update thread, and the main-thread loop that shows its frames
             self.update_thread = threading.Thread(target=self._update_frame)
             self.update_thread.daemon = True
             self.update_thread.start()
+            self._display_after_id = self.after(DISPLAY_POLL_MS, self._display_tick)
+            
+            # Initialize the face detector while the user lines up the shot
+            self._warm_up_future = self._analysis_executor.submit(
+                self._warm_up_detector, self.camera.width, self.camera.height
+            )
         else:
             self.main_window.show_error(
                 "Camera Error", 
@@ -347,16 +467,37 @@ class CameraFrame(ttk.Frame):
         if not self.is_camera_running:
             return
             
-        # Stop the frame update thread
+        # Stop the frame update thread and the display loop
         self.frame_update_running = False
+        self._live_view.set()
+        if self._display_after_id is not None:
+            self.after_cancel(self._display_after_id)
+            self._display_after_id = None
         if self.update_thread and self.update_thread.is_alive():
             self.update_thread.join(timeout=1.0)
             
+        # Skip a detector warm-up that hasn't started yet
+        if self._warm_up_future is not None:
+            self._warm_up_future.cancel()
+            self._warm_up_future = None
+            
         # Stop the camera
         if self.camera:
             self.camera.stop()
             self.camera = None
             
+        # Release the frames and conversion buffers held for the live view
+        with self._recent_frames_lock:
+            self.recent_frames.clear()
+        self._predetection = None
+        try:
+            self._frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._resize_buffer = None
+        self._rgba_buffers = queue.SimpleQueue()
+        self._preview_geometry = None
+            
         # Update UI
         self.is_camera_running = False
         self.camera_toggle_btn.config(text="Start Camera")
@@ -366,52 +507,222 @@ class CameraFrame(ttk.Frame):
         
         # Clear canvas
         self.canvas.delete("all")
+        self._canvas_image = None
+        self._overlay_text = None
+        self._photo = None
+        
+    def close(self):
+        """
+        Stop the camera and shut down the background workers, on application exit.
+        
+        Queued analyses are dropped, saves already requested still complete.
+        """
+        self.stop_camera()
+        self._analysis_executor.shutdown(wait=False, cancel_futures=True)
+        self._save_executor.shutdown(wait=False)
         
     def _update_frame(self):
         """
-        Update the camera frame continuously.
+        Convert camera frames for display continuously.
+        
+        Runs on a background thread and never touches Tk, the converted image is
+        left in a one-slot queue for _display_tick to show on the main thread, so
+        at most one frame is ever waiting to be displayed.
         """
+        skipped_last = False
         while self.frame_update_running and self.camera:
             try:
-                # Skip frame updates if an image is frozen
+                # Skip frame updates if an image is frozen, resuming as soon as it's cleared
                 if self.is_image_frozen:
-                    time.sleep(0.1)  # Longer sleep when frozen
+                    self._live_view.wait(0.5)
                     continue
                 
-                # Get frame from camera
-                frame = self.camera.get_frame()
+                # Wait for the camera to deliver a new frame, which paces the loop at its frame rate
+                frame = self.camera.get_frame(wait_new=True, timeout=0.5)
                 
                 if frame is not None:
                     self.current_frame = frame
+                    with self._recent_frames_lock:
+                        self.recent_frames.append(frame)
+                    self._schedule_predetection(frame)
                     
-                    # Convert to Tkinter image
-                    frame_h, frame_w = frame.shape[:2]
-                    canvas_w = self.canvas.winfo_width()
-                    canvas_h = self.canvas.winfo_height()
+                    # The Tk thread hasn't shown the last frame yet, so it's falling
+                    # behind; convert only every other frame until it catches up
+                    if self._frame_queue.full() and not skipped_last:
+                        skipped_last = True
+                        continue
+                    skipped_last = False
                     
-                    # Calculate scaling to fit the canvas while maintaining aspect ratio
-                    scale = min(canvas_w/frame_w, canvas_h/frame_h)
-                    new_w = int(frame_w * scale)
-                    new_h = int(frame_h * scale)
+                    # The display size only changes with the frame or canvas size
+                    geometry_key = (frame.shape[:2], self._canvas_size)
+                    if self._preview_geometry is None or self._preview_geometry[0] != geometry_key:
+                        self._preview_geometry = (geometry_key, *self._fit_preview(frame.shape[:2], self._canvas_size))
+                    _, size, interpolation = self._preview_geometry
                     
-                    # Convert and resize the image
-                    img_tk = self.camera.get_tk_image(frame, (new_w, new_h))
+                    # Convert and resize the image into reused buffers, the RGBA
+                    # image is pasted into the photo without an extra Pillow copy
+                    rgba_buffer = self._take_rgba_buffer(size)
+                    pil_img = self.camera.get_pil_image(
+                        frame, size,
+                        rgb_out=rgba_buffer,
+                        resized_out=self._resize_buffer,
+                        interpolation=interpolation
+                    )
                     
-                    if img_tk:
-                        # Update canvas
-                        self.canvas.delete("all")
-                        self.canvas.create_image(
-                            canvas_w//2, canvas_h//2, 
-                            anchor=tk.CENTER, 
-                            image=img_tk
-                        )
-                        self.canvas.image = img_tk  # Keep a reference
+                    if pil_img:
+                        self._offer_image(pil_img, rgba_buffer)
+                    else:
+                        self._rgba_buffers.put(rgba_buffer)
             except Exception as e:
                 print(f"Error updating frame: {str(e)}")
                 
-            # Sleep to reduce CPU usage
-            time.sleep(0.03)  # ~30 FPS
+    def _schedule_predetection(self, frame):
+        """
+        Search a live frame for a face on the analysis thread, when a search is due.
+        
+        Runs on the capture thread.
+        
+        Args:
+            frame: The newest camera frame
+        """
+        now = time.monotonic()
+        future = self._predetect_future
+        if now < self._next_predetect or (future is not None and not future.done()):
+            return
+        self._predetect_future = self._analysis_executor.submit(self._predetect, frame)
+        
+    def _predetect(self, frame):
+        """
+        Remember the face in a live frame for the next capture, runs on the analysis thread.
+        
+        Args:
+            frame: The camera frame
+        """
+        analyzer = self.face_analyzer
+        started = time.monotonic()
+        try:
+            detection_frame, scale = self._detection_frame(frame)
+            detection = analyzer.detect_face(detection_frame)
+        except Exception as e:
+            logger.warning("Face search error: %s", e)
+            detection = None
+            
+        self._predetection = None if detection is None else (analyzer, frame, detection, scale)
+        finished = time.monotonic()
+        self._next_predetect = finished + max(
+            PREDETECT_INTERVAL, (finished - started) * (1 / PREDETECT_MAX_LOAD - 1)
+        )
+        
+    @staticmethod
+    def _detection_frame(frame):
+        """
+        Shrink a high resolution frame by a whole factor for face detection.
+        
+        Args:
+            frame: The camera frame
+            
+        Returns:
+            Tuple of the frame to detect faces on and the factor its regions scale up by
+        """
+        frame_h, frame_w = frame.shape[:2]
+        scale = -(-max(frame_h, frame_w) // ANALYSIS_MAX_SIDE)
+        if scale > 1:
+            frame = cv2.resize(frame, (frame_w // scale, frame_h // scale), interpolation=cv2.INTER_AREA)
+        return frame, scale
+        
+    def _fit_preview(self, frame_shape, canvas_size):
+        """
+        Work out the preview size of a frame and reallocate the conversion buffers for it.
+        
+        Args:
+            frame_shape: The (height, width) of the camera frame
+            canvas_size: The (width, height) of the canvas
+            
+        Returns:
+            Tuple of the (width, height) to show the frame at and the interpolation to resize it with
+        """
+        frame_h, frame_w = frame_shape
+        canvas_w, canvas_h = canvas_size
+        
+        # Calculate scaling to fit the canvas while maintaining aspect ratio
+        scale = min(canvas_w/frame_w, canvas_h/frame_h)
+        new_w = max(1, int(frame_w * scale))
+        new_h = max(1, int(frame_h * scale))
+        
+        self._resize_buffer = np.empty((new_h, new_w, 3), np.uint8)
+        
+        # Area averaging is the cheapest clean filter for shrinking, linear for enlarging
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        return (new_w, new_h), interpolation
+        
+    def _take_rgba_buffer(self, size):
+        """
+        Get a free RGBA buffer for a preview size, allocating one if none is pooled.
+        
+        Args:
+            size: The (width, height) of the preview
+            
+        Returns:
+            np.ndarray: The buffer
+        """
+        shape = (size[1], size[0], 4)
+        while True:
+            try:
+                buffer = self._rgba_buffers.get_nowait()
+            except queue.Empty:
+                return np.empty(shape, np.uint8)
+            # Buffers of an earlier preview size are dropped
+            if buffer.shape == shape:
+                return buffer
+                
+    def _offer_image(self, pil_img, rgba_buffer):
+        """
+        Hand a converted frame to the Tk thread, replacing one it hasn't shown yet.
+        
+        Args:
+            pil_img: The converted frame
+            rgba_buffer: The buffer the frame's pixels live in
+        """
+        try:
+            self._frame_queue.put_nowait((pil_img, rgba_buffer))
+        except queue.Full:
+            try:
+                _, dropped_buffer = self._frame_queue.get_nowait()
+                self._rgba_buffers.put(dropped_buffer)
+            except queue.Empty:
+                pass
+            self._frame_queue.put_nowait((pil_img, rgba_buffer))
             
+    def _display_tick(self):
+        """
+        Show the newest converted frame on the canvas, on the Tk main thread.
+        """
+        self._display_after_id = None
+        # No frames are produced while the view is frozen, _clear_analysis restarts the loop
+        if not self.frame_update_running or self.is_image_frozen:
+            return
+            
+        try:
+            pil_img, rgba_buffer = self._frame_queue.get_nowait()
+        except queue.Empty:
+            pil_img = None
+            
+        if pil_img is not None:
+            self._show_image(pil_img, *self._canvas_size)
+            # The photo holds its own copy of the pixels, the buffer can be reused
+            self._rgba_buffers.put(rgba_buffer)
+            
+        self._display_after_id = self.after(DISPLAY_POLL_MS, self._display_tick)
+    
+    def _on_canvas_resize(self, event):
+        """
+        Remember the canvas size so the capture thread doesn't have to query Tk.
+        
+        Args:
+            event: The configure event
+        """
+        self._canvas_size = (max(1, event.width), max(1, event.height))
+    
     def capture_and_analyze(self):
         """
         Capture the current frame and analyze it. If an image is already captured,
@@ -422,19 +733,28 @@ class CameraFrame(ttk.Frame):
             self._clear_analysis()
             return
             
-        if not self.is_camera_running or self.current_frame is None:
+        if not self.is_camera_running:
+            return
+            
+        # Snapshot the recent frames once, the capture thread keeps replacing them
+        with self._recent_frames_lock:
+            frames = list(self.recent_frames)
+        if not frames:
             return
             
-        # Make a copy of the current frame to freeze it
-        self.frozen_frame = self.current_frame.copy()
+        # Freeze the newest frame. Camera frames are read-only and the capture
+        # thread never reuses one that is still referenced, so no copy is needed
+        self.frozen_frame = frames[-1]
+        self.captured_frames = frames
         self.is_image_frozen = True  # Set flag to stop live updates
+        self._live_view.clear()
         
         # Disable the button during analysis
         self.capture_btn.config(state=tk.DISABLED)
         self.status_label.config(text="Analyzing face...")
         
-        # Start analysis in a separate thread
-        threading.Thread(target=self._perform_analysis).start()
+        # Run the analysis on the long-lived analysis thread
+        self._analysis_executor.submit(self._perform_analysis)
         
     def _clear_analysis(self):
         """
@@ -443,16 +763,25 @@ class CameraFrame(ttk.Frame):
         # Clear the analysis result
         self.analysis_result = None
         self.frozen_frame = None
+        self.captured_frames = []
         self.visualization_frame = None
+        self.visualization_result = None
+        
+        # Drop the frame converted before the freeze so it doesn't flash up again
+        try:
+            _, stale_buffer = self._frame_queue.get_nowait()
+            self._rgba_buffers.put(stale_buffer)
+        except queue.Empty:
+            pass
+            
         self.is_image_frozen = False  # Allow live updates again
+        self._live_view.set()
+        if self.frame_update_running and self._display_after_id is None:
+            self._display_after_id = self.after(DISPLAY_POLL_MS, self._display_tick)
         
         # Reset UI elements
         self.face_status_value.config(text="Not detected", foreground="red")
-        self.age_value.config(text="-")
-        self.gender_value.config(text="-")
-        self.emotion_value.config(text="-")
-        self.race_value.config(text="-")
-        self.confidence_value.config(text="-")
+        self._clear_result_values()
         
         # Change button back to "Capture & Analyze"
         self.capture_btn.config(text="Capture & Analyze")
@@ -463,49 +792,65 @@ class CameraFrame(ttk.Frame):
         
         self.status_label.config(text="Camera running")
         
+    def _warm_up_detector(self, width, height):
+        """
+        Run the face detector once on a blank frame, runs on the analysis thread.
+        
+        Args:
+            width: Width of the camera frames
+            height: Height of the camera frames
+        """
+        try:
+            self.face_analyzer.detect_face(np.zeros((height, width, 3), dtype=np.uint8))
+        except Exception as e:
+            logger.warning("Detector warm-up error: %s", e)
+            
     def _perform_analysis(self):
         """
-        Perform face analysis on the current frame.
+        Perform face analysis on the most recent frames, keeping the clearest face.
         """
         try:
-            # Analyze the frozen frame
-            result = self.face_analyzer.analyze_face(
-                self.frozen_frame,
-                actions=['age', 'gender', 'emotion', 'race']
-            )
+            actions = ['age', 'gender', 'emotion', 'race']
             
+            # A face already found in the captured frame spares detecting again,
+            # faces found in other frames are not used so the image stays the one captured
+            predetection, self._predetection = self._predetection, None
+            if (predetection is not None and predetection[0] is self.face_analyzer
+                    and predetection[1] is self.frozen_frame):
+                _, _, detection, scale = predetection
+            else:
+                # Detect on shrunken copies of high resolution frames and keep
+                # the frame with the most confident face detection
+                detection_frames = [self._detection_frame(frame) for frame in self.captured_frames]
+                scale = detection_frames[0][1]
+                index, detection = self.face_analyzer.detect_best_face(
+                    [frame for frame, _ in detection_frames]
+                )
+                if index is not None:
+                    self.frozen_frame = self.captured_frames[index]
+                    
+            result = None
+            if detection is not None:
+                # Reuse the analysis of a recent capture of a near-identical face
+                face_hash = average_hash(detection[0])
+                result = self._cached_analysis(face_hash, detection)
+                if result is None:
+                    result = self.face_analyzer.analyze_detections([detection], actions)[0]
+                    if result is not None:
+                        self._cache_analysis(face_hash, result)
+                        
+            if result is not None:
+                result['region'] = scale_region(result['region'], scale)
                 
-            # If we have a result, draw the face box on the image
+            # Only a face with located eyes is marked, on the shown and saved images
+            self.visualization_frame = self.frozen_frame
             if result and isinstance(result, dict) and 'region' in result and result["region"]["left_eye"] != None:
-                # Get face region
-                region = result['region']
-                x, y, w, h = region['x'], region['y'], region['w'], region['h']
-                
-                # Draw rectangle on the frozen frame
-                frame_with_box = self.frozen_frame.copy()
-                cv2.rectangle(frame_with_box, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                
-                # Draw eye positions if available
-                if 'left_eye' in region and 'right_eye' in region:
-                    left_eye = tuple(map(int, region['left_eye']))
-                    right_eye = tuple(map(int, region['right_eye']))
-                    cv2.circle(frame_with_box, left_eye, 5, (255, 0, 0), -1)
-                    cv2.circle(frame_with_box, right_eye, 5, (255, 0, 0), -1)
+                self.visualization_result = result
                 
-                # Add age text at top of bounding box
-                age = result.get('age', 'N/A')
-                gender = result.get('dominant_gender', 'N/A')
-                cv2.putText(frame_with_box, f"Age: {age}, {gender}", (x, y-10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                
-                # Store the visualization frame
-                self.visualization_frame = frame_with_box
-                
-                # Display the visualization frame
-                self._update_canvas_with_image(self.visualization_frame)
+                # Display the marked frame, Tk is only touched on the main thread
+                self.after(0, self._update_canvas_with_image, self.visualization_frame, result)
             else:
-                # No face region detected, use the frozen frame
-                self.visualization_frame = self.frozen_frame.copy()
+                self.visualization_result = None
                 
             # Update UI with results
             self.after(0, lambda: self._update_results(result))
@@ -516,45 +861,142 @@ class CameraFrame(ttk.Frame):
             print(f"Analysis error: {str(capture_e)}")
             self.after(0, lambda: self._handle_analysis_error(str(capture_e)))
             
-    def _update_canvas_with_image(self, frame):
+    def _cached_analysis(self, face_hash, detection):
+        """
+        Look up the recent analysis of a face that looks like this one.
+        
+        Analyses older than ANALYSIS_CACHE_MAX_AGE are dropped instead of reused.
+        
+        Args:
+            face_hash: The average hash of the detected face crop
+            detection: The face detection, its region and confidence replace the cached ones
+            
+        Returns:
+            The cached analysis result or None if no similar face was analyzed recently
+        """
+        now = time.monotonic()
+        for cached_hash, (analyzed_at, result) in list(self._analysis_cache.items()):
+            if now - analyzed_at > ANALYSIS_CACHE_MAX_AGE:
+                del self._analysis_cache[cached_hash]
+            elif hash_distance(cached_hash, face_hash) <= ANALYSIS_CACHE_MAX_DISTANCE:
+                self._analysis_cache.move_to_end(cached_hash)
+                result = dict(result)
+                _, result['region'], result['face_confidence'] = detection
+                return result
+        return None
+        
+    def _cache_analysis(self, face_hash, result):
+        """
+        Remember an analysis result, evicting the least recently used one when full.
+        
+        Args:
+            face_hash: The average hash of the analyzed face crop
+            result: The analysis result
+        """
+        self._analysis_cache[face_hash] = (time.monotonic(), dict(result))
+        self._analysis_cache.move_to_end(face_hash)
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+            
+    def _update_canvas_with_image(self, frame, result=None):
         """
         Update the canvas with the given frame.
         
         Args:
             frame: The frame to display
+            result: Analysis result whose face is marked on the shown image, if any
         """
         try:
             # Get canvas dimensions
-            canvas_w = self.canvas.winfo_width()
-            canvas_h = self.canvas.winfo_height()
+            canvas_w, canvas_h = self._canvas_size
             
             # Get frame dimensions
             frame_h, frame_w = frame.shape[:2]
             
             # Calculate scaling to fit the canvas while maintaining aspect ratio
             scale = min(canvas_w/frame_w, canvas_h/frame_h)
-            new_w = int(frame_w * scale)
-            new_h = int(frame_h * scale)
-            
-            # Convert and resize the image
-            # Convert BGR to RGB for PIL
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(rgb_frame)
-            pil_img = pil_img.resize((new_w, new_h), Image.LANCZOS)
-            img_tk = ImageTk.PhotoImage(image=pil_img)
-            
-            # Update canvas
-            self.canvas.delete("all")
-            self.canvas.create_image(
-                canvas_w//2, canvas_h//2, 
-                anchor=tk.CENTER, 
-                image=img_tk
-            )
-            self.canvas.image = img_tk  # Keep a reference
+            new_w = max(1, int(frame_w * scale))
+            new_h = max(1, int(frame_h * scale))
+            
+            # Resize before converting BGR to RGB so the conversion touches fewer pixels,
+            # with the same filters as the live preview so the frozen frame matches it
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            resized = cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+            
+            # Mark the face on the small copy, the full resolution frame is only
+            # marked if it gets saved
+            if result is not None:
+                self._mark_face(resized, result, scale)
+                
+            rgb_frame = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=resized)
+            pil_img = Image.frombuffer('RGB', (new_w, new_h), rgb_frame, 'raw', 'RGB', 0, 1)
+            
+            self._show_image(pil_img, canvas_w, canvas_h)
             
         except Exception as e:
             print(f"Error updating canvas: {str(e)}")
             
+    @staticmethod
+    def _mark_face(frame, result, scale=1.0):
+        """
+        Draw the face box, eye positions and age of an analysis result onto a frame.
+        
+        Args:
+            frame: The BGR frame to draw on, modified in place
+            result: The analysis result with the face region
+            scale: The factor from the analyzed frame's coordinates to this frame's
+        """
+        region = result['region']
+        x, y, w, h = (int(round(region[key] * scale)) for key in ('x', 'y', 'w', 'h'))
+        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+        
+        # Draw eye positions if available
+        if region.get('left_eye') is not None and region.get('right_eye') is not None:
+            for eye in (region['left_eye'], region['right_eye']):
+                center = tuple(int(round(value * scale)) for value in eye)
+                cv2.circle(frame, center, 5, (255, 0, 0), -1)
+                
+        # Add age text at top of bounding box
+        age = result.get('age', 'N/A')
+        gender = result.get('dominant_gender', 'N/A')
+        cv2.putText(frame, f"Age: {age}, {gender}", (x, y-10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        
+    def _show_image(self, pil_img, canvas_w, canvas_h):
+        """
+        Show an image centered on the canvas.
+        
+        The PhotoImage and canvas item are kept between calls, a same-sized image
+        is pasted into the existing photo instead of allocating a new one, and the
+        item is only moved or reconfigured when the canvas or image size changes.
+        
+        Args:
+            pil_img: The RGB image to show
+            canvas_w: Width of the canvas
+            canvas_h: Height of the canvas
+        """
+        new_photo = self._photo is None or (self._photo.width(), self._photo.height()) != pil_img.size
+        if new_photo:
+            self._photo = ImageTk.PhotoImage(image=pil_img)
+        else:
+            self._photo.paste(pil_img)
+            
+        center = (canvas_w//2, canvas_h//2)
+        if self._canvas_image is None:
+            self._canvas_image = self.canvas.create_image(
+                *center, 
+                anchor=tk.CENTER, 
+                image=self._photo
+            )
+            self._canvas_image_center = center
+        else:
+            # A pasted photo updates in place, the item only changes with the size
+            if center != self._canvas_image_center:
+                self.canvas.coords(self._canvas_image, *center)
+                self._canvas_image_center = center
+            if new_photo:
+                self.canvas.itemconfigure(self._canvas_image, image=self._photo)
+    
     def _update_results(self, result):
         """
         Update the UI with analysis results.
@@ -570,22 +1012,32 @@ class CameraFrame(ttk.Frame):
             self.face_status_value.config(text="Detected", foreground="green")
             
             # Update result values
-            self.age_value.config(text=f"{result.get('age', 'N/A')} years")
+            age_text = f"{result.get('age', 'N/A')} years"
             
             # For gender, use dominant_gender and its confidence from the gender dict
             gender = result.get('dominant_gender', 'N/A')
             gender_confidence = result.get('gender', {}).get(gender, 0) if result.get('gender') else 0
-            self.gender_value.config(text=f"{gender} ({gender_confidence:.1f}%)")
+            gender_text = f"{gender} ({gender_confidence:.1f}%)"
             
             # For emotion, use dominant_emotion and its confidence from the emotion dict
             emotion = result.get('dominant_emotion', 'N/A')
             emotion_confidence = result.get('emotion', {}).get(emotion, 0) if result.get('emotion') else 0
-            self.emotion_value.config(text=f"{emotion.capitalize()} ({emotion_confidence:.1f}%)")
+            emotion_text = f"{emotion.capitalize()} ({emotion_confidence:.1f}%)"
             
             # For race, use dominant_race and its confidence from the race dict
             race = result.get('dominant_race', 'N/A')
             race_confidence = result.get('race', {}).get(race, 0) if result.get('race') else 0
-            self.race_value.config(text=f"{race.capitalize()} ({race_confidence:.1f}%)")
+            race_text = f"{race.capitalize()} ({race_confidence:.1f}%)"
+            
+            self._set_label_text(self.age_value, age_text)
+            self._set_label_text(self.gender_value, gender_text)
+            self._set_label_text(self.emotion_value, emotion_text)
+            self._set_label_text(self.race_value, race_text)
+            
+            # Summarize the results over the feed in a single canvas item
+            self._set_overlay(
+                f"Age: {age_text}\nGender: {gender_text}\nEmotion: {emotion_text}\nRace: {race_text}"
+            )
             
             # Change capture button to "Clear Image"
             self.capture_btn.config(text="Clear Image")
@@ -599,11 +1051,7 @@ class CameraFrame(ttk.Frame):
             self.face_status_value.config(text="Not detected", foreground="red")
             
             # Clear result values
-            self.age_value.config(text="-")
-            self.gender_value.config(text="-")
-            self.emotion_value.config(text="-")
-            self.race_value.config(text="-")
-            self.confidence_value.config(text="-")
+            self._clear_result_values()
             
             # Disable save and show all buttons
             self.save_btn.config(state=tk.DISABLED)
@@ -619,6 +1067,47 @@ class CameraFrame(ttk.Frame):
         self.capture_btn.config(state=tk.NORMAL)
         self.status_label.config(text="Analysis complete")
         
+    def _set_label_text(self, label, text):
+        """
+        Set a result label's text, skipping the re-layout when it is unchanged.
+        
+        Args:
+            label: The label to update
+            text: The new text
+        """
+        if self._label_texts.get(label) != text:
+            label.config(text=text)
+            self._label_texts[label] = text
+            
+    def _set_overlay(self, text):
+        """
+        Show text over the top left of the camera feed.
+        
+        Args:
+            text: The text to show, empty to hide the overlay
+        """
+        if self._overlay_text is None:
+            self._overlay_text = self.canvas.create_text(
+                10, 10,
+                anchor=tk.NW,
+                fill="lime",
+                font=("TkDefaultFont", 12, "bold"),
+                text=text
+            )
+        else:
+            self.canvas.itemconfigure(self._overlay_text, text=text)
+        self.canvas.tag_raise(self._overlay_text)
+        
+    def _clear_result_values(self):
+        """
+        Reset the result labels and the overlay.
+        """
+        for label in (self.age_value, self.gender_value, self.emotion_value,
+                      self.race_value, self.confidence_value):
+            self._set_label_text(label, "-")
+        if self._overlay_text is not None:
+            self.canvas.itemconfigure(self._overlay_text, text="")
+            
     def _handle_analysis_error(self, error_message):
         """
         Handle analysis errors.
@@ -628,11 +1117,7 @@ class CameraFrame(ttk.Frame):
         """
         # Clear result values
         self.face_status_value.config(text="Error", foreground="red")
-        self.age_value.config(text="-")
-        self.gender_value.config(text="-")
-        self.emotion_value.config(text="-")
-        self.race_value.config(text="-")
-        self.confidence_value.config(text="-")
+        self._clear_result_values()
         
         # Re-enable the capture button
         self.capture_btn.config(state=tk.NORMAL)
@@ -665,38 +1150,61 @@ class CameraFrame(ttk.Frame):
         )
         
         if file_path:
-            try:
-                # Save the image with annotations
-                cv2.imwrite(file_path, save_frame)
-                
-                # Save analysis result as JSON if available
-                if self.analysis_result:
-                    json_path = Path(file_path).with_suffix('.json')
-                    import json
-                    
-                    # Convert numpy arrays to lists for JSON serialization
-                    result_copy = {}
-                    for key, value in self.analysis_result.items():
-                        if isinstance(value, dict):
-                            result_copy[key] = {k: float(v) if hasattr(v, 'item') else v for k, v in value.items()}
-                        elif hasattr(value, 'tolist') and callable(getattr(value, 'tolist')):
-                            result_copy[key] = value.tolist()
-                        else:
-                            result_copy[key] = value
-                    
-                    with open(json_path, 'w') as f:
-                        json.dump(result_copy, f, indent=4)
-                        
-                self.main_window.show_info(
-                    "Save Successful", 
-                    f"Image saved to {file_path}\nJSON data saved to {Path(file_path).with_suffix('.json')}"
-                )
+            # Encode and write on the save thread so the UI doesn't stall on disk I/O
+            future = self._save_executor.submit(
+                self._write_image, file_path, save_frame, self.analysis_result, self.visualization_result
+            )
+            future.add_done_callback(lambda f: self.after(0, self._on_image_saved, file_path, f))
+            
+    @staticmethod
+    def _write_image(file_path, frame, analysis_result, marked_result=None):
+        """
+        Write an image and its analysis result to disk, runs on the save thread.
+        
+        Args:
+            file_path: The path to save the image to
+            frame: The image to save
+            analysis_result: The analysis result to save next to it, if any
+            marked_result: Analysis result whose face is marked on the saved image, if any
+        """
+        # Save the image with annotations, drawn on a copy since frames are shared
+        if marked_result is not None:
+            frame = frame.copy()
+            CameraFrame._mark_face(frame, marked_result)
+            
+        suffix = Path(file_path).suffix.lower() or '.jpg'
+        params = SAVE_JPEG_PARAMS if suffix in ('.jpg', '.jpeg') else []
+        ok, encoded = cv2.imencode(suffix, frame, params)
+        if not ok:
+            raise ValueError("the image could not be encoded")
+        with open(file_path, 'wb') as f:
+            f.write(encoded)
+            
+        # Save analysis result as JSON if available
+        if analysis_result:
+            json_path = Path(file_path).with_suffix('.json')
+            with open(json_path, 'wb') as f:
+                f.write(json_bytes(analysis_result))
                 
-            except Exception as e:
-                self.main_window.show_error(
-                    "Save Error", 
-                    f"Error saving image: {str(e)}"
-                )
+    def _on_image_saved(self, file_path, future):
+        """
+        Report the outcome of a save, on the Tk main thread.
+        
+        Args:
+            file_path: The path the image was saved to
+            future: The finished save
+        """
+        error = future.exception()
+        if error is None:
+            self.main_window.show_info(
+                "Save Successful", 
+                f"Image saved to {file_path}\nJSON data saved to {Path(file_path).with_suffix('.json')}"
+            )
+        else:
+            self.main_window.show_error(
+                "Save Error", 
+                f"Error saving image: {str(error)}"
+            )
                 
     def _update_detector(self, event=None):
         """
@@ -706,9 +1214,37 @@ class CameraFrame(ttk.Frame):
             event: The event that triggered the update
         """
         detector = self.detector_var.get()
-        self.face_analyzer.detector_backend = detector
+        self.face_analyzer = self._get_analyzer(detector)
+        # Results of the previous detector no longer apply, replaced rather than
+        # cleared since an analysis may be reading it
+        self._analysis_cache = OrderedDict()
         print(f"Face detector changed to: {detector}")
         
+        # Build the newly selected detector before the next capture needs it
+        width, height = (self.camera.width, self.camera.height) if self.camera else (640, 480)
+        self._analysis_executor.submit(self._warm_up_detector, width, height)
+        
+    def _get_analyzer(self, detector):
+        """
+        Get the analyzer for a detector backend, creating it on first use.
+        
+        Switching back to a detector reuses its analyzer along with the detector
+        state and input buffers it already built.
+        
+        Args:
+            detector: The face detector backend
+            
+        Returns:
+            FaceAnalyzer: The analyzer using that detector
+        """
+        analyzer = self._analyzers.get(detector)
+        if analyzer is None:
+            analyzer = self._analyzers[detector] = FaceAnalyzer(
+                detector_backend=detector,
+                detection_max_side=CAMERA_DETECTION_MAX_SIDE
+            )
+        return analyzer
+        
     def _preload_models(self):
         """
         Preload the models to avoid delays during analysis.
@@ -732,11 +1268,23 @@ class CameraFrame(ttk.Frame):
         """
         self.preload_btn.config(state=tk.NORMAL)
         self.status_label.config(text="Models loaded")
+        
+        # The attribute models were warmed up as they loaded, do the same for the detector
+        width, height = (self.camera.width, self.camera.height) if self.camera else (640, 480)
+        self._analysis_executor.submit(self._warm_up_detector, width, height)
+        
         self.main_window.show_info(
             "Models Loaded",
             "All models have been successfully loaded!"
         )
         
+    def on_models_ready(self):
+        """
+        Handle the models finishing loading in the background.
+        """
+        if not self.is_camera_running:
+            self.status_label.config(text="Models loaded")
+            
     def show_all_results(self):
         """
         Show all analysis results in a new window.
@@ -762,19 +1310,7 @@ class CameraFrame(ttk.Frame):
         text_widget.config(yscrollcommand=scrollbar.set)
         
         # Insert the results
-        import json
-        
-        # Convert numpy arrays to lists for JSON serialization
-        result_copy = {}
-        for key, value in self.analysis_result.items():
-            if isinstance(value, dict):
-                result_copy[key] = {k: float(v) if hasattr(v, 'item') else v for k, v in value.items()}
-            elif hasattr(value, 'tolist') and callable(getattr(value, 'tolist')):
-                result_copy[key] = value.tolist()
-            else:
-                result_copy[key] = value
-        
-        text_widget.insert(tk.END, json.dumps(result_copy, indent=4))
+        text_widget.insert(tk.END, format_json(self.analysis_result))
         text_widget.config(state=tk.DISABLED)  # Make read-only
         
         # Add a close button
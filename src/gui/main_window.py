@@ -11,6 +11,7 @@ import os
 from src.gui.camera_frame import CameraFrame
 from src.gui.batch_frame import BatchFrame
 from src.gui.results_frame import ResultsFrame
+from src.batch_processor import to_dataframe
 
 class MainWindow:
     """
@@ -41,13 +42,16 @@ class MainWindow:
         
         # Create the frames
         self.camera_frame = CameraFrame(self.notebook, self)
-        self.batch_frame = BatchFrame(self.notebook, self)
+        self.batch_frame = BatchFrame(self.notebook, self, on_complete=self._on_batch_complete)
         self.results_frame = ResultsFrame(self.notebook, self)
         
         # Add frames to notebook
         self.notebook.add(self.camera_frame, text="Camera")
         self.notebook.add(self.batch_frame, text="Batch Processing")
         
+        # The results tab is added the first time results are shown
+        self._results_tab_added = False
+        
         # Create the bottom frame for controls
         self.bottom_frame = ttk.Frame(self.main_frame)
         self.bottom_frame.pack(fill=tk.X, pady=(10, 0))
@@ -111,11 +115,35 @@ class MainWindow:
         self.results_frame.update_results(results, failed_files)
         
         # Add the results tab if not already added
-        if "Results" not in [self.notebook.tab(i, "text") for i in range(self.notebook.index("end"))]:
+        if not self._results_tab_added:
             self.notebook.add(self.results_frame, text="Results")
+            self._results_tab_added = True
             
         # Switch to the results tab
-        self.notebook.select(self.notebook.index(self.results_frame))
+        self.notebook.select(self.results_frame)
+        
+    def _on_batch_complete(self, results, failed_files):
+        """
+        Refresh the results tab with a finished batch run, if it is already open.
+        
+        The tab isn't switched to, "View Results" still does that.
+        
+        Args:
+            results: List of result dictionaries from the run
+            failed_files: List of files that failed analysis
+        """
+        if not self._results_tab_added:
+            return
+            
+        self.current_results = to_dataframe(results, self.batch_frame.current_actions)
+        self.failed_files = failed_files
+        self.results_frame.update_results(self.current_results, failed_files)
+        
+    def on_models_ready(self):
+        """
+        Handle the startup model preload finishing.
+        """
+        self.camera_frame.on_models_ready()
         
     def show_error(self, title, message):
         """
@@ -142,9 +170,13 @@ class MainWindow:
         Exit the application after cleanup.
         """
         try:
-            # Stop camera if running
+            # Stop camera if running, along with its analysis and save threads
             if hasattr(self, 'camera_frame') and self.camera_frame:
-                self.camera_frame.stop_camera()
+                self.camera_frame.close()
+                
+            # Stop the batch worker processes
+            if hasattr(self, 'batch_frame') and self.batch_frame:
+                self.batch_frame.batch_processor.close()
                 
             # Destroy the root window
             self.root.destroy()
@@ -1,11 +1,20 @@
 """
 Results frame for displaying analysis results.
 """
+import os
 import tkinter as tk
 from tkinter import ttk
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional
-import json
+
+from src.export import format_json
+
+# Result rows added to the treeview at a time, more are added as it is scrolled down
+ROW_CHUNK = 200
+
+# Delay before filters are applied after a change, edits within it are applied together
+FILTER_DELAY_MS = 50
 
 class ResultsFrame(ttk.Frame):
     """
@@ -25,6 +34,35 @@ class ResultsFrame(ttk.Frame):
         # Data
         self.results = None
         self.failed_files = None
+        self._file_names = {}
+        
+        # Whether the failed files list holds the current failed files, it is
+        # only filled once its tab is shown
+        self._failed_listed = False
+        
+        # Values and treeview item of each result row and whether it is shown.
+        # Items are only created once scrolled to and are detached rather
+        # than deleted when filtered out.
+        self._row_values = []
+        self._row_items = []
+        self._row_by_item = {}
+        self._shown = np.zeros(0, dtype=bool)
+        
+        # Rows matching the filters and how many of them are shown so far
+        self._matches = np.zeros(0, dtype=np.intp)
+        self._loaded = 0
+        self._load_after_id = None
+        
+        # Columns the filters and summary work on, ages are made numeric and
+        # emotions lower-cased once
+        self._ages = None
+        self._genders = None
+        self._emotions = None
+        self._filter_after_id = None
+        
+        # Details window, built on first use and hidden rather than destroyed on close
+        self._details_window = None
+        self._details_text = None
         
         # Create UI components
         self._create_widgets()
@@ -99,6 +137,12 @@ class ResultsFrame(ttk.Frame):
         )
         self.emotion_combo.pack(side=tk.LEFT)
         
+        # Apply the filters as they are edited
+        self.age_min_entry.bind("<KeyRelease>", self._schedule_filters)
+        self.age_max_entry.bind("<KeyRelease>", self._schedule_filters)
+        self.gender_combo.bind("<<ComboboxSelected>>", self._schedule_filters)
+        self.emotion_combo.bind("<<ComboboxSelected>>", self._schedule_filters)
+        
         # Filter button
         self.filter_btn = ttk.Button(
             self.filter_frame, 
@@ -152,7 +196,7 @@ class ResultsFrame(ttk.Frame):
         
         # Add scrollbars
         self.y_scrollbar = ttk.Scrollbar(self.results_tree_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
-        self.results_tree.configure(yscrollcommand=self.y_scrollbar.set)
+        self.results_tree.configure(yscrollcommand=self._on_tree_scroll)
         
         self.x_scrollbar = ttk.Scrollbar(self.results_tree_frame, orient=tk.HORIZONTAL, command=self.results_tree.xview)
         self.results_tree.configure(xscrollcommand=self.x_scrollbar.set)
@@ -177,6 +221,8 @@ class ResultsFrame(ttk.Frame):
         self.failed_list.configure(yscrollcommand=self.failed_scrollbar.set)
         self.failed_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        
         # Summary area
         self.summary_frame = ttk.LabelFrame(self, text="Summary")
         self.summary_frame.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="ew")
@@ -264,30 +310,31 @@ class ResultsFrame(ttk.Frame):
         self.results = results
         self.failed_files = failed_files or []
         
+        # File names shown for each path, worked out once per update
+        paths = results['file_path'].unique() if 'file_path' in results.columns else ()
+        self._file_names = {path: os.path.basename(path) for path in paths}
+        
         # Clear existing data
         self._clear_display()
         
         # Update the treeview with results
-        if not results.empty:
-            for _, row in results.iterrows():
-                file_path = row.get('file_path', '')
-                age = row.get('age', 'N/A')
-                gender = row.get('gender', 'N/A')
-                emotion = row.get('dominant_emotion', 'N/A').capitalize()
-                race = row.get('dominant_race', 'N/A').capitalize()
-                
-                file_name = file_path.split('/')[-1] if '/' in file_path else file_path.split('\\')[-1] if '\\' in file_path else file_path
-                
-                self.results_tree.insert(
-                    "", tk.END, 
-                    values=(file_name, age, gender, emotion, race),
-                    tags=("result",)
-                )
+        self._load_rows(results)
+        if 'age' in results.columns:
+            self._ages = pd.to_numeric(results['age'], errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            self._ages = None
+        if 'dominant_gender' in results.columns:
+            self._genders = results['dominant_gender'].to_numpy()
+        else:
+            self._genders = None
+        if 'dominant_emotion' in results.columns:
+            self._emotions = results['dominant_emotion'].str.lower().to_numpy()
+        else:
+            self._emotions = None
                 
-        # Update failed files list
-        for file_path in self.failed_files:
-            file_name = file_path.split('/')[-1] if '/' in file_path else file_path.split('\\')[-1] if '\\' in file_path else file_path
-            self.failed_list.insert(tk.END, file_name)
+        # Update failed files list, now if its tab is open or else once it is shown
+        self._failed_listed = False
+        self._on_tab_changed()
             
         # Update summary statistics
         self._update_summary()
@@ -299,13 +346,133 @@ class ResultsFrame(ttk.Frame):
         self.notebook.tab(0, text=f"Results ({success_count})")
         self.notebook.tab(1, text=f"Failed Files ({failed_count})")
         
+    def _rows_to_values(self, results: pd.DataFrame) -> List[tuple]:
+        """
+        Build the treeview values of every result row, a column at a time.
+        
+        Args:
+            results: DataFrame of analysis results
+            
+        Returns:
+            List[tuple]: The (file, age, gender, emotion, race) values of each row
+        """
+        def column(name, default, capitalize=False):
+            if name not in results.columns:
+                return np.full(len(results), default, dtype=object)
+            if capitalize:
+                return results[name].str.capitalize().to_numpy()
+            return results[name].to_numpy()
+            
+        file_names = [self._file_names.get(file_path, file_path) for file_path in column('file_path', '')]
+        emotions = column('dominant_emotion', 'N/A', capitalize=True)
+        races = column('dominant_race', 'N/A', capitalize=True)
+        return list(zip(file_names, column('age', 'N/A'), column('dominant_gender', 'N/A'), emotions, races))
+        
+    def _load_rows(self, results: pd.DataFrame):
+        """
+        Prepare the result rows for the treeview and show the first of them.
+        
+        Args:
+            results: DataFrame of the results to show
+        """
+        self._row_values = self._rows_to_values(results)
+        self._row_items = [None] * len(self._row_values)
+        self._row_by_item = {}
+        self._shown = np.zeros(len(self._row_values), dtype=bool)
+        self._show_rows(np.ones(len(self._row_values), dtype=bool))
+        
+    def _show_rows(self, mask: np.ndarray):
+        """
+        Show the result rows selected by a mask and detach the others.
+        
+        Only the first ROW_CHUNK matching rows are shown, _load_more_rows adds
+        the next ones as the treeview is scrolled. Only the rows whose
+        visibility changes are touched, the shown rows keep the order of the
+        results.
+        
+        Args:
+            mask: Boolean array with one entry per result row
+        """
+        self._matches = np.flatnonzero(mask)
+        self._loaded = min(ROW_CHUNK, len(self._matches))
+        shown = np.zeros(len(mask), dtype=bool)
+        shown[self._matches[:self._loaded]] = True
+        
+        hidden = np.flatnonzero(self._shown & ~shown)
+        if len(hidden):
+            self.results_tree.detach(*[self._row_items[i] for i in hidden])
+            
+        positions = np.cumsum(shown) - 1
+        for i in np.flatnonzero(shown & ~self._shown):
+            self._place_row(i, int(positions[i]))
+            
+        self._shown = shown
+        
+    def _place_row(self, row: int, index: int):
+        """
+        Put a result row at an index of the treeview, creating its item on first use.
+        
+        Args:
+            row: Position of the row in the results
+            index: Index among the shown rows to put it at
+        """
+        item = self._row_items[row]
+        if item is None:
+            # Call Tk directly, Treeview.insert would join the values into a string first
+            item = self.results_tree.tk.call(
+                self.results_tree._w, "insert", "", index, "-values", self._row_values[row]
+            )
+            self._row_items[row] = item
+            self._row_by_item[item] = row
+        else:
+            self.results_tree.move(item, "", index)
+            
+    def _on_tree_scroll(self, first: str, last: str):
+        """
+        Update the scrollbar and show more rows once the end of the treeview is in view.
+        
+        Args:
+            first: Fraction of the rows above the view
+            last: Fraction of the rows up to the end of the view
+        """
+        self.y_scrollbar.set(first, last)
+        if float(last) > 0.9 and self._loaded < len(self._matches) and self._load_after_id is None:
+            self._load_after_id = self.after_idle(self._load_more_rows)
+            
+    def _load_more_rows(self):
+        """
+        Show the next ROW_CHUNK matching rows at the end of the treeview.
+        """
+        self._load_after_id = None
+        rows = self._matches[self._loaded:self._loaded + ROW_CHUNK]
+        for index, row in enumerate(rows, start=self._loaded):
+            self._place_row(row, index)
+            
+        self._shown[rows] = True
+        self._loaded += len(rows)
+            
+    def _on_tab_changed(self, event=None):
+        """
+        Fill the failed files list when its tab is shown.
+        
+        Args:
+            event: The Tk event of the tab change
+        """
+        if self._failed_listed or self.notebook.select() != str(self.failed_tab):
+            return
+            
+        if self.failed_files:
+            self.failed_list.insert(tk.END, *[os.path.basename(file_path) for file_path in self.failed_files])
+        self._failed_listed = True
+        
     def _clear_display(self):
         """
         Clear all displayed data.
         """
-        # Clear treeview
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        # Clear treeview, including rows detached by a filter
+        items = [item for item in self._row_items if item is not None]
+        if items:
+            self.results_tree.delete(*items)
             
         # Clear failed files list
         self.failed_list.delete(0, tk.END)
@@ -323,50 +490,55 @@ class ResultsFrame(ttk.Frame):
         self.success_value.config(text=str(success_count))
         self.failed_value.config(text=str(failed_count))
         
-        # Calculate age statistics
-        if not self.results.empty and 'age' in self.results.columns:
-            try:
-                avg_age = self.results['age'].mean()
-                min_age = self.results['age'].min()
-                max_age = self.results['age'].max()
-                
-                self.age_avg_value.config(text=f"{avg_age:.1f}")
-                self.age_min_value.config(text=str(min_age))
-                self.age_max_value.config(text=str(max_age))
-            except:
-                # Handle non-numeric age values
-                self.age_avg_value.config(text="-")
-                self.age_min_value.config(text="-")
-                self.age_max_value.config(text="-")
+        # Calculate age statistics over one float array, skipping missing ages
+        ages = self._ages[~np.isnan(self._ages)] if self._ages is not None else None
+        if ages is not None and ages.size:
+            self.age_avg_value.config(text=f"{ages.mean():.1f}")
+            self.age_min_value.config(text=f"{ages.min():g}")
+            self.age_max_value.config(text=f"{ages.max():g}")
         else:
             self.age_avg_value.config(text="-")
             self.age_min_value.config(text="-")
             self.age_max_value.config(text="-")
             
         # Calculate gender statistics
-        if not self.results.empty and 'gender' in self.results.columns:
-            try:
-                gender_counts = self.results['gender'].value_counts()
-                
-                men_count = gender_counts.get('Man', 0)
-                women_count = gender_counts.get('Woman', 0)
-                
-                men_pct = (men_count / success_count) * 100 if success_count > 0 else 0
-                women_pct = (women_count / success_count) * 100 if success_count > 0 else 0
-                
-                self.men_value.config(text=f"{men_count} ({men_pct:.1f}%)")
-                self.women_value.config(text=f"{women_count} ({women_pct:.1f}%)")
-            except:
-                self.men_value.config(text="0 (0%)")
-                self.women_value.config(text="0 (0%)")
+        if self._genders is not None and success_count > 0:
+            men_count = int(np.count_nonzero(self._genders == 'Man'))
+            women_count = int(np.count_nonzero(self._genders == 'Woman'))
+            
+            men_pct = (men_count / success_count) * 100
+            women_pct = (women_count / success_count) * 100
+            
+            self.men_value.config(text=f"{men_count} ({men_pct:.1f}%)")
+            self.women_value.config(text=f"{women_count} ({women_pct:.1f}%)")
         else:
             self.men_value.config(text="0 (0%)")
             self.women_value.config(text="0 (0%)")
             
+    def _schedule_filters(self, event=None):
+        """
+        Apply the filters shortly, restarting the delay on every change.
+        
+        Args:
+            event: The Tk event of the change
+        """
+        self._cancel_filters()
+        self._filter_after_id = self.after(FILTER_DELAY_MS, self._apply_filters)
+        
+    def _cancel_filters(self):
+        """
+        Cancel filters scheduled to be applied.
+        """
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+            self._filter_after_id = None
+            
     def _apply_filters(self):
         """
         Apply filters to the results.
         """
+        self._cancel_filters()
+        
         if self.results is None or self.results.empty:
             return
             
@@ -376,79 +548,45 @@ class ResultsFrame(ttk.Frame):
         gender = self.gender_var.get()
         emotion = self.emotion_var.get()
         
-        # Create a copy of the results
-        filtered_results = self.results.copy()
+        # Select the matching rows
+        mask = np.ones(len(self.results), dtype=bool)
         
-        # Apply age filter
-        if age_min and age_min.isdigit():
-            filtered_results = filtered_results[filtered_results['age'] >= int(age_min)]
+        # Apply age filter, filters on columns the results don't have are skipped
+        if self._ages is not None and age_min.isdigit():
+            mask &= self._ages >= int(age_min)
             
-        if age_max and age_max.isdigit():
-            filtered_results = filtered_results[filtered_results['age'] <= int(age_max)]
+        if self._ages is not None and age_max.isdigit():
+            mask &= self._ages <= int(age_max)
             
         # Apply gender filter
-        if gender != "All":
-            filtered_results = filtered_results[filtered_results['gender'] == gender]
+        if self._genders is not None and gender != "All":
+            mask &= self._genders == gender
             
         # Apply emotion filter
-        if emotion != "All":
-            filtered_results = filtered_results[filtered_results['dominant_emotion'].str.lower() == emotion.lower()]
-            
-        # Clear and update the treeview
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-            
-        for _, row in filtered_results.iterrows():
-            file_path = row.get('file_path', '')
-            age = row.get('age', 'N/A')
-            gender = row.get('gender', 'N/A')
-            emotion = row.get('dominant_emotion', 'N/A').capitalize()
-            race = row.get('dominant_race', 'N/A').capitalize()
+        if self._emotions is not None and emotion != "All":
+            mask &= self._emotions == emotion.lower()
             
-            file_name = file_path.split('/')[-1] if '/' in file_path else file_path.split('\\')[-1] if '\\' in file_path else file_path
-            
-            self.results_tree.insert(
-                "", tk.END, 
-                values=(file_name, age, gender, emotion, race),
-                tags=("result",)
-            )
+        # Show the matching rows and detach the others
+        self._show_rows(mask)
             
         # Update the results tab text
-        self.notebook.tab(0, text=f"Results ({len(filtered_results)})")
+        self.notebook.tab(0, text=f"Results ({np.count_nonzero(mask)})")
         
     def _reset_filters(self):
         """
         Reset all filters and show all results.
         """
+        self._cancel_filters()
+        
         # Clear filter values
         self.age_min_var.set("")
         self.age_max_var.set("")
         self.gender_var.set("All")
         self.emotion_var.set("All")
         
-        # Refresh the display with all results
-        self._clear_display()
-        
+        # Show all results again
         if not self.results.empty:
-            for _, row in self.results.iterrows():
-                file_path = row.get('file_path', '')
-                age = row.get('age', 'N/A')
-                gender = row.get('gender', 'N/A')
-                emotion = row.get('dominant_emotion', 'N/A').capitalize()
-                race = row.get('dominant_race', 'N/A').capitalize()
-                
-                file_name = file_path.split('/')[-1] if '/' in file_path else file_path.split('\\')[-1] if '\\' in file_path else file_path
-                
-                self.results_tree.insert(
-                    "", tk.END, 
-                    values=(file_name, age, gender, emotion, race),
-                    tags=("result",)
-                )
-                
-            # Update failed files list
-            for file_path in self.failed_files:
-                file_name = file_path.split('/')[-1] if '/' in file_path else file_path.split('\\')[-1] if '\\' in file_path else file_path
-                self.failed_list.insert(tk.END, file_name)
+            self._show_rows(np.ones(len(self.results), dtype=bool))
                 
             # Reset tab text
             self.notebook.tab(0, text=f"Results ({len(self.results)})")
@@ -466,19 +604,10 @@ class ResultsFrame(ttk.Frame):
             )
             return
             
-        # Get the selected item index
-        selected_item = selected_items[0]
-        values = self.results_tree.item(selected_item, 'values')
-        file_name = values[0]
-        
         # Find the corresponding data in the results DataFrame
-        result_data = None
-        for _, row in self.results.iterrows():
-            path = row.get('file_path', '')
-            if path.endswith(file_name):
-                result_data = row.to_dict()
-                break
-                
+        row = self._row_by_item.get(selected_items[0])
+        result_data = self.results.iloc[row].to_dict() if row is not None else None
+        
         if not result_data:
             self.main_window.show_error(
                 "Data Error", 
@@ -496,10 +625,27 @@ class ResultsFrame(ttk.Frame):
         Args:
             result_data: The result data dictionary
         """
+        if self._details_window is None:
+            self._create_details_window()
+            
+        # Format and insert the results
+        self._details_text.config(state=tk.NORMAL)
+        self._details_text.delete("1.0", tk.END)
+        self._details_text.insert(tk.END, format_json(result_data))
+        self._details_text.config(state=tk.DISABLED)  # Make read-only
+        
+        self._details_window.deiconify()
+        self._details_window.lift()
+        self._details_window.grab_set()  # Make window modal
+        
+    def _create_details_window(self):
+        """
+        Build the details window, it is reused for every result shown.
+        """
         details_window = tk.Toplevel(self)
         details_window.title("Result Details")
         details_window.geometry("700x500")
-        details_window.grab_set()  # Make window modal
+        details_window.protocol("WM_DELETE_WINDOW", self._hide_details_window)
         
         # Create a text widget to display the results
         text_frame = ttk.Frame(details_window)
@@ -512,14 +658,20 @@ class ResultsFrame(ttk.Frame):
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         text_widget.config(yscrollcommand=scrollbar.set)
         
-        # Format and insert the results
-        text_widget.insert(tk.END, json.dumps(result_data, indent=4))
-        text_widget.config(state=tk.DISABLED)  # Make read-only
-        
         # Add a close button
         close_btn = ttk.Button(
             details_window, 
             text="Close", 
-            command=details_window.destroy
+            command=self._hide_details_window
         )
         close_btn.pack(pady=(0, 10))
+        
+        self._details_window = details_window
+        self._details_text = text_widget
+        
+    def _hide_details_window(self):
+        """
+        Hide the details window so it can be shown again without rebuilding it.
+        """
+        self._details_window.grab_release()
+        self._details_window.withdraw()
@@ -0,0 +1,97 @@
+"""
+Read-ahead of image files for the batch pipeline.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+class ImagePrefetcher:
+    """
+    Reads image files ahead of the analysis workers on background threads.
+    
+    Files are read in order, keeping up to queue_depth reads in flight, so a
+    worker asking for a file usually finds its bytes already in memory.
+    """
+    def __init__(self, file_paths: List[str], queue_depth: int = 64, max_workers: int = 4):
+        """
+        Initialize the prefetcher and start reading the first files.
+        
+        Args:
+            file_paths: Paths of the files to read, in the order they will be used
+            queue_depth: Maximum number of files read ahead of the workers
+            max_workers: Number of reader threads
+        """
+        self.file_paths = file_paths
+        self.queue_depth = queue_depth
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending: Dict[str, Future] = {}
+        self._taken: Set[str] = set()
+        self._next_index = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        
+        with self._lock:
+            self._fill()
+    
+    @staticmethod
+    def _read_file(file_path: str) -> Optional[bytes]:
+        """
+        Read the raw bytes of a file.
+        
+        Args:
+            file_path: The file to read
+        
+        Returns:
+            Optional[bytes]: The file contents or None if it couldn't be read
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _fill(self) -> None:
+        """
+        Submit reads until queue_depth files are in flight. Must hold the lock.
+        """
+        if self._closed:
+            return
+        while len(self._pending) < self.queue_depth and self._next_index < len(self.file_paths):
+            file_path = self.file_paths[self._next_index]
+            self._next_index += 1
+            if file_path in self._taken:
+                continue
+            self._pending[file_path] = self._executor.submit(self._read_file, file_path)
+    
+    def get(self, file_path: str) -> Optional[bytes]:
+        """
+        Get the contents of a file, waiting for its read if it is still in flight.
+        
+        Args:
+            file_path: The file to get
+        
+        Returns:
+            Optional[bytes]: The file contents or None if it couldn't be read
+        """
+        with self._lock:
+            future = self._pending.pop(file_path, None)
+            if future is None:
+                self._taken.add(file_path)
+            self._fill()
+        
+        if future is None or future.cancelled():
+            # Not prefetched, e.g. a worker ran ahead of the read window
+            return self._read_file(file_path)
+        return future.result()
+    
+    def close(self) -> None:
+        """
+        Stop the reader threads and drop any reads that haven't started.
+        """
+        with self._lock:
+            self._closed = True
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=False)
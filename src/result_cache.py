@@ -0,0 +1,121 @@
+"""
+Persistent cache of analysis results keyed by image content.
+"""
+import hashlib
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Default location of the cache database
+DEFAULT_CACHE_PATH = Path.home() / ".age_detection" / "result_cache.sqlite3"
+
+def content_digest(data: bytes) -> str:
+    """
+    Hash file contents, using BLAKE3 when it is installed.
+    
+    Args:
+        data: The raw bytes of a file
+    
+    Returns:
+        str: The hex digest, prefixed with the algorithm so the two never collide
+    """
+    if blake3 is not None:
+        return "b3:" + blake3.blake3(data).hexdigest()
+    return "b2:" + hashlib.blake2b(data, digest_size=20).hexdigest()
+
+class ResultCache:
+    """
+    Stores analysis results in an SQLite database so unchanged images aren't analyzed again.
+    
+    Results are keyed by the image contents together with the analysis settings,
+    so renamed or copied files hit the cache and edited files miss it.
+    """
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None):
+        """
+        Open the cache, creating the database if needed.
+        
+        Args:
+            cache_path: Path of the cache database
+        """
+        self.cache_path = Path(cache_path or DEFAULT_CACHE_PATH)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Shared by the detection threads, the lock serializes access to the connection
+        self._connection = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result BLOB NOT NULL)"
+                )
+    
+    @staticmethod
+    def make_key(data: bytes, actions: List[str], settings: Tuple[Any, ...]) -> str:
+        """
+        Build the cache key of an image.
+        
+        Args:
+            data: The raw bytes of the image file
+            actions: List of analysis actions performed
+            settings: Analyzer settings that affect the result
+        
+        Returns:
+            str: The cache key
+        """
+        return f"{content_digest(data)}|{','.join(sorted(actions))}|{settings!r}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            Optional[Dict[str, Any]]: A fresh copy of the result or None if it isn't cached
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0])
+    
+    def put_many(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Store several results in one transaction.
+        
+        Args:
+            items: (cache key, result) pairs
+        """
+        if not items:
+            return
+        rows = [(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)) for key, result in items]
+        with self._lock:
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)", rows)
+    
+    def clear(self) -> None:
+        """
+        Remove all cached results.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM results")
+            self._connection.execute("VACUUM")
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -2,10 +2,43 @@
 Utility functions for the Age Detection App.
 """
 import os
-import datetime
 import json
+import logging
+import logging.handlers
+import mmap
+import queue
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Union
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Lowercase suffixes of the image types the app can analyze
+SUPPORTED_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp'})
+
+# Threads listing subfolders in parallel when searching recursively
+SCAN_WORKERS = 8
+
+# Image files at least this large are memory-mapped rather than read when loading
+MMAP_MIN_SIZE = 64 * 1024
+
+# Large JPEGs are decoded at 1/2, 1/4 or 1/8 scale as long as their longer side
+# stays at least this long, which is still well above the 224 pixel model input
+REDUCED_DECODE_MIN_SIDE = 1920
+
+# JPEG start-of-frame markers, the frame header holds the image dimensions
+_JPEG_SOF_MARKERS = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+
+# Case-insensitive match of the same suffixes, cheaper per name than splitting and lowercasing
+IMAGE_FILE_PATTERN = re.compile(
+    r'\.(?:' + '|'.join(re.escape(ext[1:]) for ext in sorted(SUPPORTED_IMAGE_EXTENSIONS)) + r')\Z',
+    re.IGNORECASE
+)
 
 def validate_face_detection(analysis_result: Dict[str, Any]) -> bool:
     """
@@ -49,7 +82,7 @@ def generate_timestamp_filename(prefix: str, extension: str) -> str:
     Returns:
         str: The generated filename
     """
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     return f"{prefix}_{timestamp}.{extension}"
 
 def format_confidence(confidence: float) -> str:
@@ -81,7 +114,7 @@ def get_supported_image_extensions() -> List[str]:
     Returns:
         List[str]: List of supported extensions
     """
-    return ['.jpg', '.jpeg', '.png', '.bmp']
+    return sorted(SUPPORTED_IMAGE_EXTENSIONS)
 
 def is_supported_image(file_path: Path) -> bool:
     """
@@ -93,4 +126,300 @@ def is_supported_image(file_path: Path) -> bool:
     Returns:
         bool: True if the file is a supported image, False otherwise
     """
-    return file_path.suffix.lower() in get_supported_image_extensions()
+    return file_path.suffix.lower() in SUPPORTED_IMAGE_EXTENSIONS
+
+
+def load_image(file_path: Union[str, Path]) -> Optional[np.ndarray]:
+    """
+    Decode an image file with OpenCV.
+    
+    Larger files are memory-mapped and decoded in place, smaller ones are read
+    into memory since mapping them costs more than it saves.
+    
+    Args:
+        file_path: The image file to read
+        
+    Returns:
+        Optional[np.ndarray]: The image in BGR order or None if it couldn't be decoded
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                return decode_image(f.read())
+                
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                data = np.frombuffer(mapped, np.uint8)
+                image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+                # The mapping can't be closed while an array still exports it
+                del data
+                return image
+            finally:
+                mapped.close()
+    except Exception:
+        return None
+
+def decode_image(data: Optional[bytes]) -> Optional[np.ndarray]:
+    """
+    Decode image file contents with OpenCV.
+    
+    Args:
+        data: The raw bytes of an image file
+        
+    Returns:
+        Optional[np.ndarray]: The image in BGR order or None if it couldn't be decoded
+    """
+    if not data:
+        return None
+    try:
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    except Exception:
+        return None
+
+def jpeg_dimensions(data: np.ndarray) -> Optional[Tuple[int, int]]:
+    """
+    Read the dimensions of a JPEG from its frame header without decoding it.
+    
+    Args:
+        data: The raw bytes of an image file as a uint8 array
+        
+    Returns:
+        Optional[Tuple[int, int]]: Width and height or None if the data isn't a readable JPEG
+    """
+    size = len(data)
+    if size < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+        
+    # Walk the marker segments, skipping each by its length, until the frame header
+    offset = 2
+    while offset + 9 < size:
+        if data[offset] != 0xFF:
+            return None
+        marker = int(data[offset + 1])
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = (int(data[offset + 5]) << 8) | int(data[offset + 6])
+            width = (int(data[offset + 7]) << 8) | int(data[offset + 8])
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            offset += 2
+            continue
+        offset += 2 + ((int(data[offset + 2]) << 8) | int(data[offset + 3]))
+    return None
+
+def load_image_reduced(file_path: Union[str, Path]) -> Tuple[Optional[np.ndarray], int]:
+    """
+    Decode an image file with OpenCV, decoding large JPEGs at a reduced scale.
+    
+    Files are read or memory-mapped like in load_image.
+    
+    Args:
+        file_path: The image file to read
+        
+    Returns:
+        Tuple[Optional[np.ndarray], int]: The image in BGR order or None if it
+            couldn't be decoded, and the factor it was scaled down by
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                return decode_image_reduced(f.read())
+                
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return decode_image_reduced(mapped)
+            finally:
+                mapped.close()
+    except Exception:
+        return None, 1
+
+def decode_image_reduced(data: Optional[Union[bytes, mmap.mmap]]) -> Tuple[Optional[np.ndarray], int]:
+    """
+    Decode image file contents, decoding large JPEGs at a reduced scale.
+    
+    libjpeg scales during the inverse DCT, so a reduced decode skips most of the
+    work of a full one. Other formats are decoded at full size.
+    
+    Args:
+        data: The raw bytes of an image file, or a mapping of it
+        
+    Returns:
+        Tuple[Optional[np.ndarray], int]: The image in BGR order or None if it
+            couldn't be decoded, and the factor it was scaled down by
+    """
+    if not data:
+        return None, 1
+    try:
+        buffer = np.frombuffer(data, np.uint8)
+        
+        flag, scale = cv2.IMREAD_COLOR, 1
+        dimensions = jpeg_dimensions(buffer)
+        if dimensions is not None:
+            longer_side = max(dimensions)
+            for factor, reduced_flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                                         (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+                if longer_side // factor >= REDUCED_DECODE_MIN_SIDE:
+                    flag, scale = reduced_flag, factor
+                    break
+                    
+        return cv2.imdecode(buffer, flag), scale
+    except Exception:
+        return None, 1
+
+def scale_region(region: Dict[str, Any], scale: int) -> Dict[str, Any]:
+    """
+    Scale a face region found on a reduced image back to the original image.
+    
+    Args:
+        region: The face region with x, y, w, h and optional eye positions
+        scale: The factor the image was scaled down by
+        
+    Returns:
+        Dict[str, Any]: The region in original image coordinates
+    """
+    if scale == 1:
+        return region
+    scaled = dict(region)
+    for key in ('x', 'y', 'w', 'h'):
+        scaled[key] = region[key] * scale
+    for key in ('left_eye', 'right_eye'):
+        if scaled.get(key) is not None:
+            scaled[key] = tuple(value * scale for value in scaled[key])
+    return scaled
+
+def average_hash(image: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Compute a perceptual average hash of an image.
+    
+    Images that look alike get hashes a few bits apart, so the hash can tell
+    whether two camera frames show the same scene.
+    
+    Args:
+        image: The image in BGR order
+        hash_size: Side of the grid the image is reduced to, the hash has hash_size**2 bits
+        
+    Returns:
+        int: The hash, one bit per grid cell brighter than the mean
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (hash_size, hash_size), interpolation=cv2.INTER_AREA)
+    bits = np.packbits(small > small.mean())
+    return int.from_bytes(bits.tobytes(), 'big')
+
+def hash_distance(first: int, second: int) -> int:
+    """
+    Count the bits in which two perceptual hashes differ.
+    
+    Args:
+        first: The first hash
+        second: The second hash
+        
+    Returns:
+        int: The Hamming distance between the hashes
+    """
+    return bin(first ^ second).count('1')
+
+def _scan_folder(folder_path: str, recursive: bool) -> Tuple[List[str], List[str]]:
+    """
+    List the supported image files and, optionally, the subfolders of one folder.
+    
+    Args:
+        folder_path: The folder to list
+        recursive: Whether to collect subfolders
+        
+    Returns:
+        Tuple[List[str], List[str]]: Paths of the image files and of the subfolders
+    """
+    image_files = []
+    subfolders = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            # Follow links to files like glob does, but not links to folders
+            if entry.is_file():
+                if IMAGE_FILE_PATTERN.search(entry.name):
+                    image_files.append(entry.path)
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+    return image_files, subfolders
+
+def _scan_subfolder(folder_path: str) -> Tuple[List[str], List[str]]:
+    """
+    List a subfolder found while searching recursively, skipping it if it can't be read.
+    
+    Args:
+        folder_path: The subfolder to list
+        
+    Returns:
+        Tuple[List[str], List[str]]: Paths of the image files and of the subfolders,
+            both empty if the subfolder could not be read
+    """
+    try:
+        return _scan_folder(folder_path, True)
+    except OSError as e:
+        logger.warning("Skipping unreadable folder %s: %s", folder_path, e)
+        return [], []
+
+def find_image_files(folder_path: Union[str, Path], recursive: bool = False) -> List[str]:
+    """
+    Find all supported image files in a folder.
+    
+    Uses os.scandir so the file type comes from the directory entry instead of
+    an extra stat call per file. Subfolders are listed in parallel, which hides
+    most of the directory read latency on network drives and large trees.
+    Subfolders that can't be read are skipped with a warning, only an error
+    reading folder_path itself is raised.
+    
+    Args:
+        folder_path: The folder to search
+        recursive: Whether to search subfolders as well
+        
+    Returns:
+        List[str]: Paths of the supported image files, sorted
+    """
+    image_files, subfolders = _scan_folder(os.fspath(folder_path), recursive)
+    if not subfolders:
+        # Directory order differs between file systems, sort so every run matches
+        image_files.sort()
+        return image_files
+        
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="scan") as executor:
+        pending = {executor.submit(_scan_subfolder, subfolder) for subfolder in subfolders}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subfolders = future.result()
+                image_files.extend(files)
+                pending.update(executor.submit(_scan_subfolder, subfolder) for subfolder in subfolders)
+                
+    # Folders finish in any order, sort so runs over the same tree match
+    image_files.sort()
+    return image_files
+
+def start_logging(level: int = logging.WARNING) -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue so worker threads never block on console output.
+    
+    Handlers attached to the root logger only enqueue records, a listener thread
+    writes them to stderr.
+    
+    Args:
+        level: Minimum level of the records to log
+        
+    Returns:
+        logging.handlers.QueueListener: The running listener, stop it on exit to flush pending records
+    """
+    log_queue = queue.Queue(-1)
+    
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return listener
@@ -0,0 +1,61 @@
+"""
+Tests for the utility functions.
+"""
+import os
+import stat
+
+import pytest
+
+from src.utils import helpers
+from src.utils.helpers import find_image_files
+
+
+def test_find_image_files_skips_unreadable_subfolders(tmp_path, monkeypatch):
+    """
+    A subfolder that can't be read is skipped instead of failing the whole search.
+    """
+    (tmp_path / "a.jpg").touch()
+    (tmp_path / "readable").mkdir()
+    (tmp_path / "readable" / "b.png").touch()
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "c.jpg").touch()
+    locked.chmod(0)
+    
+    # Permissions don't stop root, so refuse to list the folder directly then
+    if os.access(locked, os.R_OK):
+        scandir = os.scandir
+        
+        def refuse_locked(path):
+            if os.fspath(path) == str(locked):
+                raise PermissionError(13, "Permission denied", str(locked))
+            return scandir(path)
+            
+        monkeypatch.setattr(helpers.os, "scandir", refuse_locked)
+        
+    try:
+        files = find_image_files(tmp_path, recursive=True)
+    finally:
+        locked.chmod(stat.S_IRWXU)
+        
+    assert files == [str(tmp_path / "a.jpg"), str(tmp_path / "readable" / "b.png")]
+
+
+def test_find_image_files_raises_for_missing_folder(tmp_path):
+    """
+    An error reading the searched folder itself reaches the caller.
+    """
+    with pytest.raises(OSError):
+        find_image_files(tmp_path / "missing", recursive=True)
+
+
+@pytest.mark.parametrize("recursive", [False, True])
+def test_find_image_files_sorts_flat_folders(tmp_path, recursive):
+    """
+    Files are sorted even when there are no subfolders to walk.
+    """
+    names = ["c.jpg", "a.png", "b.bmp"]
+    for name in names:
+        (tmp_path / name).touch()
+        
+    assert find_image_files(tmp_path, recursive=recursive) == [str(tmp_path / name) for name in sorted(names)]